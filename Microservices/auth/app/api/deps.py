@@ -1,19 +1,47 @@
 from collections.abc import Generator
 from typing import Annotated
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt import PyJWTError
 from pydantic import ValidationError
 from sqlmodel import Session
 from app.core import security
 from app.core.config import settings
-from app.core.db import engine
+from app.core.db import engine, replica_router
+from app.core.deadline import bind_deadline, request_deadline
+from app.core.replicas import READ_METHODS, read_primary_until
 from app.models import TokenPayload, User
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login/access-token")
-def get_db() -> Generator[Session, None, None]:
+def request_principal(request: Request) -> str | None:
+    # Routing hint only (never used for authorization): the user id forwarded by
+    # Traefik ForwardAuth, else the subject of the bearer token.
+    user_id = request.headers.get("X-User-Id")
+    if user_id:
+        return user_id
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"]).get("sub")
+    except PyJWTError:
+        return None
+def get_db(request: Request) -> Generator[Session, None, None]:
+    principal = request_principal(request)
+    # Queries run with a statement_timeout of what is left of the request budget.
+    deadline = request_deadline(request)
+    if request.method in READ_METHODS:
+        with Session(replica_router.engine_for_read(principal, read_primary_until(request))) as session:
+            bind_deadline(session, deadline)
+            yield session
+        return
+    # Writes go to the primary; the principal then reads from the primary until
+    # replicas have caught up (read-your-writes).
+    replica_router.mark_write(principal)
     with Session(engine) as session:
+        bind_deadline(session, deadline)
         yield session
+    replica_router.mark_write(principal)
 SessionDep = Annotated[Session, Depends(get_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 def get_current_user(session: SessionDep, token: TokenDep) -> User:
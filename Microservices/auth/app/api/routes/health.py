@@ -0,0 +1,21 @@
+from typing import Any
+
+from fastapi import APIRouter, Response
+
+from app.core.health import prober
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+SERVICE = "auth"
+
+# Both probes only read memory; the DB check runs in the background prober.
+@router.get("/live")
+async def live() -> Any:
+    return {"status": "alive", "service": SERVICE}
+
+@router.get("/ready")
+async def ready(response: Response) -> Any:
+    is_ready, report = prober.readiness()
+    if not is_ready:
+        response.status_code = 503
+    return {"status": "ready" if is_ready else "not ready", "service": SERVICE, **report}
@@ -7,6 +7,7 @@ from fastapi.security import OAuth2PasswordRequestForm
 
 from app.core import security
 from app.core.config import settings
+from app.core.throttle import client_ip, login_throttle
 from app.api.deps import SessionDep, CurrentUser
 from app.models import Token, UserPublic, UserCreate
 from app import crud
@@ -35,6 +36,7 @@ def health_check():
 # ---------------------------------------------------------------------------
 @router.post(f"{settings.API_V1_STR}/login/access-token", response_model=Token)
 def login_access_token(
+    request: Request,
     session: SessionDep,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()]
 ) -> Any:
@@ -44,6 +46,9 @@ def login_access_token(
     Returns:
         Token: JWT access token
     """
+    # Before any query or bcrypt work: 429 once the address or account is out of attempts
+    login_throttle.check(client_ip(request), form_data.username)
+
     user = crud.authenticate(
         session=session,
         email=form_data.username,
@@ -78,7 +83,7 @@ def login_access_token(
 # REGISTER : /api/v1/users/
 # ---------------------------------------------------------------------------
 @router.post(f"{settings.API_V1_STR}/users/", response_model=UserPublic)
-def register_user(session: SessionDep, user_in: UserCreate) -> Any:
+def register_user(request: Request, session: SessionDep, user_in: UserCreate) -> Any:
     """
     Create new user.
     
@@ -89,6 +94,9 @@ def register_user(session: SessionDep, user_in: UserCreate) -> Any:
         UserPublic: Created user
     """
     
+    # Hashing the password costs as much as a login attempt: same buckets
+    login_throttle.check(client_ip(request), user_in.email)
+
     # Vérifier si l'email existe déjà
     existing_user = crud.get_user_by_email(session=session, email=user_in.email)
     if existing_user:
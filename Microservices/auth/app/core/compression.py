@@ -0,0 +1,188 @@
+import importlib.util
+import os
+import zlib
+from collections.abc import Callable
+from typing import Any
+
+# Bodies smaller than this are sent as is: below about one packet, compressing
+# saves nothing on the wire and still costs CPU.
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+# Levels tuned for dynamic responses (fast, most of the gain).
+GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "5"))
+ZSTD_LEVEL = int(os.getenv("COMPRESS_ZSTD_LEVEL", "3"))
+BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "4"))
+
+COMPRESSIBLE_TYPES = ("text/", "application/json", "application/javascript", "application/xml")
+# SSE messages are tiny and must reach the client at once; leave them alone.
+SKIPPED_TYPES = ("text/event-stream",)
+
+
+class GzipEncoder:
+    def __init__(self) -> None:
+        self._compressor = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class ZstdEncoder:
+    def __init__(self) -> None:
+        # Imported on first use, like passlib, to keep startup fast.
+        import zstandard
+
+        self._flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+        self._compressor = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(self._flush_block)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class BrotliEncoder:
+    def __init__(self) -> None:
+        import brotli
+
+        self._compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+# Server preference, best ratio per CPU first; zstd and br only when installed.
+ENCODERS: dict[str, Callable[[], Any]] = {
+    name: encoder
+    for name, encoder, module in (
+        ("zstd", ZstdEncoder, "zstandard"),
+        ("br", BrotliEncoder, "brotli"),
+        ("gzip", GzipEncoder, None),
+    )
+    if module is None or importlib.util.find_spec(module)
+}
+
+
+def negotiate(accept_encoding: str) -> str | None:
+    """The preferred encoding the client accepts (q > 0), or None for identity."""
+    accepted: dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip()] = q
+    for name in ENCODERS:
+        if accepted.get(name, accepted.get("*", 0.0)) > 0:
+            return name
+    return None
+
+
+class CompressionMiddleware:
+    """Compress responses with the encoding negotiated from Accept-Encoding.
+
+    A response sent in one piece is compressed only if it is at least
+    ``minimum_size`` bytes, of a compressible type and not already encoded.
+    A streamed response is compressed chunk by chunk, each chunk flushed so
+    nothing is held back from the client.
+    """
+
+    def __init__(self, app: Any, minimum_size: int = COMPRESS_MIN_BYTES) -> None:
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        accept = next((v.decode("latin-1") for k, v in scope["headers"] if k == b"accept-encoding"), "")
+        encoding = negotiate(accept) if accept else None
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSend(send, encoding, self.minimum_size))
+
+
+class _CompressingSend:
+    def __init__(self, send: Callable, encoding: str, minimum_size: int) -> None:
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start: dict | None = None
+        self.encoder: Any = None
+        self.passthrough = False
+
+    async def __call__(self, message: dict) -> None:
+        if message["type"] == "http.response.start":
+            # Held back until the first body chunk shows whether to compress.
+            self.start = message
+            self.passthrough = not self._compressible(message)
+            return
+        if message["type"] != "http.response.body":
+            await self.send(message)
+            return
+        if self.passthrough:
+            if self.start is not None:
+                await self.send(self.start)
+                self.start = None
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            headers = [(k, v) for k, v in self.start["headers"] if k != b"content-length"]
+            headers.append((b"vary", b"Accept-Encoding"))
+            if not more_body and len(body) < self.minimum_size:
+                # Whole body known and small: send as is.
+                await self.send({**self.start, "headers": headers + [(b"content-length", str(len(body)).encode())]})
+                self.start = None
+                await self.send(message)
+                self.passthrough = True
+                return
+            headers.append((b"content-encoding", self.encoding.encode()))
+            self.encoder = ENCODERS[self.encoding]()
+            if not more_body:
+                data = self.encoder.compress(body) + self.encoder.finish()
+                headers.append((b"content-length", str(len(data)).encode()))
+                await self.send({**self.start, "headers": headers})
+                self.start = None
+                await self.send({"type": "http.response.body", "body": data})
+                return
+            await self.send({**self.start, "headers": headers})
+            self.start = None
+        if more_body:
+            data = self.encoder.compress(body) + self.encoder.flush()
+        else:
+            data = self.encoder.compress(body) + self.encoder.finish()
+        await self.send({"type": "http.response.body", "body": data, "more_body": more_body})
+
+    @staticmethod
+    def _compressible(start: dict) -> bool:
+        if start["status"] < 200 or start["status"] in (204, 304):
+            return False
+        headers = {k: v for k, v in start["headers"]}
+        if b"content-encoding" in headers:
+            return False
+        content_type = headers.get(b"content-type", b"").decode("latin-1").lower()
+        if content_type.startswith(SKIPPED_TYPES):
+            return False
+        return content_type.startswith(COMPRESSIBLE_TYPES) or "+json" in content_type or "+xml" in content_type
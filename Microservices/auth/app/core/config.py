@@ -8,5 +8,8 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
     ENVIRONMENT: str = "local"
+    # "replicated": items keeps its own copy of the user table, fed from the
+    # user_outbox written here. "shared": items reads the user table, no outbox.
+    PRINCIPAL_SOURCE: str = "shared"
 
 settings = Settings()
@@ -0,0 +1,105 @@
+import os
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import Column, Engine, Integer, MetaData, String, Table, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import SQLModel
+
+import app.models  # noqa: F401  (registers the tables with SQLModel.metadata)
+
+SERVICE = "auth"
+# Bump whenever the tables or indexes this service creates change.
+SCHEMA_VERSION = 4
+
+# "create": run DDL on startup (local dev, first deploy / migration job).
+# "check": one SELECT comparing SCHEMA_VERSION with the recorded version.
+DB_SCHEMA_MODE = os.getenv("DB_SCHEMA_MODE", "create")
+
+schema_version = Table(
+    "schema_version",
+    MetaData(),
+    Column("service", String(64), primary_key=True),
+    Column("version", Integer, nullable=False),
+)
+
+UPSERT = {"postgresql": postgresql.insert, "sqlite": sqlite.insert}
+
+# One lock for every service: auth and users both create the shared user table.
+SCHEMA_LOCK_KEY = "schema_version"
+
+
+@contextmanager
+def schema_lock(engine: Engine) -> Iterator[None]:
+    """Let one process at a time run the DDL (Postgres session advisory lock).
+
+    Pods of every service starting together would otherwise race on CREATE
+    TABLE / INDEX. SQLite is only used locally, where ``app.server`` creates the
+    schema once before its workers start.
+    """
+    if engine.dialect.name != "postgresql":
+        yield
+        return
+    with engine.connect() as conn:
+        conn.execute(text("SELECT pg_advisory_lock(hashtext(:key))"), {"key": SCHEMA_LOCK_KEY})
+        conn.commit()
+        try:
+            yield
+        finally:
+            conn.execute(text("SELECT pg_advisory_unlock(hashtext(:key))"), {"key": SCHEMA_LOCK_KEY})
+            conn.commit()
+
+
+# Columns first created as TIMESTAMP, now TIMESTAMPTZ. Their values were
+# written in UTC, which is how they are reinterpreted.
+TIMESTAMPTZ_COLUMNS = [("user_outbox", "created_at")]
+
+COLUMN_TYPE = text(
+    "SELECT data_type FROM information_schema.columns "
+    "WHERE table_schema = current_schema() AND table_name = :table AND column_name = :column"
+)
+
+
+def migrate_timestamptz(engine: Engine) -> None:
+    if engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        for table, column in TIMESTAMPTZ_COLUMNS:
+            if conn.execute(COLUMN_TYPE, {"table": table, "column": column}).scalar() == "timestamp without time zone":
+                conn.exec_driver_sql(
+                    f"ALTER TABLE {table} ALTER COLUMN {column} TYPE timestamptz USING {column} AT TIME ZONE 'UTC'"
+                )
+
+
+def create_schema(engine: Engine) -> None:
+    SQLModel.metadata.create_all(engine)
+    migrate_timestamptz(engine)
+    schema_version.create(engine, checkfirst=True)
+    upsert = UPSERT[engine.dialect.name](schema_version).values(service=SERVICE, version=SCHEMA_VERSION)
+    with engine.begin() as conn:
+        conn.execute(
+            upsert.on_conflict_do_update(index_elements=[schema_version.c.service], set_={"version": SCHEMA_VERSION})
+        )
+
+
+def check_schema(engine: Engine) -> None:
+    try:
+        with engine.connect() as conn:
+            version = conn.execute(
+                select(schema_version.c.version).where(schema_version.c.service == SERVICE)
+            ).scalar()
+    except SQLAlchemyError as exc:
+        raise RuntimeError(f"Cannot read {SERVICE} schema version, run once with DB_SCHEMA_MODE=create") from exc
+    if version != SCHEMA_VERSION:
+        raise RuntimeError(
+            f"{SERVICE} schema version is {version}, expected {SCHEMA_VERSION}; run with DB_SCHEMA_MODE=create"
+        )
+
+
+def prepare_database(engine: Engine) -> None:
+    if DB_SCHEMA_MODE == "check":
+        check_schema(engine)
+    else:
+        with schema_lock(engine):
+            create_schema(engine)
@@ -0,0 +1,145 @@
+import ipaddress
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Protocol
+
+from fastapi import HTTPException, Request
+from sqlalchemy import Engine, text
+
+from app.core.db import engine
+
+# Token buckets: BURST attempts at once, refilled at PER_MINUTE. Checked before
+# any password hashing, so a flood costs a dictionary lookup, not a bcrypt run.
+LOGIN_IP_BURST = float(os.getenv("LOGIN_IP_BURST", "20"))
+LOGIN_IP_PER_MINUTE = float(os.getenv("LOGIN_IP_PER_MINUTE", "10"))
+LOGIN_ACCOUNT_BURST = float(os.getenv("LOGIN_ACCOUNT_BURST", "5"))
+LOGIN_ACCOUNT_PER_MINUTE = float(os.getenv("LOGIN_ACCOUNT_PER_MINUTE", "2"))
+# "memory": per worker process, so N workers (and pods) allow N times the rates;
+# "database": shared by every worker and pod (Postgres). On Postgres with several
+# workers (app.server sets WEB_CONCURRENCY) the default is database.
+LOGIN_THROTTLE_BACKEND = os.getenv(
+    "LOGIN_THROTTLE_BACKEND",
+    "database" if int(os.getenv("WEB_CONCURRENCY", "1")) > 1 and engine.dialect.name == "postgresql" else "memory",
+)
+LOGIN_THROTTLE_MAX_KEYS = int(os.getenv("LOGIN_THROTTLE_MAX_KEYS", "100000"))
+# Addresses of the proxies in front of the service (Traefik pods, load balancer),
+# whose X-Forwarded-For entries are believed. Same setting as app.server.
+TRUSTED_PROXIES = [
+    ipaddress.ip_network(n.strip(), strict=False)
+    for n in os.getenv("TRUSTED_PROXIES", "127.0.0.1,::1,10.0.0.0/8,172.16.0.0/12,192.168.0.0/16").split(",")
+    if n.strip()
+]
+
+
+class ThrottleBackend(Protocol):
+    def take(self, key: str, burst: float, per_second: float) -> float:
+        """Take one token from ``key``'s bucket; 0 if allowed, else seconds until a token is back."""
+
+
+class MemoryBackend:
+    """Buckets in a bounded LRU dict; the least recently used key is dropped when full."""
+
+    def __init__(self, max_keys: int) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, burst: float, per_second: float) -> float:
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.pop(key, (burst, now))
+            tokens = min(burst, tokens + (now - updated) * per_second)
+            allowed = tokens >= 1
+            self._buckets[key] = (tokens - 1 if allowed else tokens, now)
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        return 0.0 if allowed else (1 - tokens) / per_second
+
+
+# One statement per check: refill from the elapsed time, take a token if there
+# is one. In DO UPDATE every expression sees the row as it was before.
+REFILL = (
+    "LEAST(:burst, login_throttle.tokens"
+    " + EXTRACT(EPOCH FROM clock_timestamp() - login_throttle.updated_at) * :per_second)"
+)
+TAKE = text(f"""
+INSERT INTO login_throttle (key, tokens, allowed, updated_at) VALUES (:key, :burst - 1, true, clock_timestamp())
+ON CONFLICT (key) DO UPDATE SET
+    tokens = {REFILL} - CASE WHEN {REFILL} >= 1 THEN 1 ELSE 0 END,
+    allowed = {REFILL} >= 1,
+    updated_at = clock_timestamp()
+RETURNING tokens, allowed
+""")
+
+
+class DatabaseBackend:
+    """Buckets in the login_throttle table (Postgres), shared by every pod.
+
+    Costs one short upsert per check, still far below a bcrypt verification.
+    Rows of idle keys are harmless; prune them with
+    ``DELETE FROM login_throttle WHERE updated_at < now() - interval '1 day'``.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+
+    def take(self, key: str, burst: float, per_second: float) -> float:
+        with self.engine.begin() as conn:
+            tokens, allowed = conn.execute(TAKE, {"key": key, "burst": burst, "per_second": per_second}).one()
+        return 0.0 if allowed else (1 - tokens) / per_second
+
+
+class LoginThrottle:
+    def __init__(self, backend: ThrottleBackend) -> None:
+        self.backend = backend
+
+    def check(self, ip: str | None, account: str) -> None:
+        """Raise 429 if the client address or the account is out of attempts.
+
+        The account bucket is only charged once the address passes, so a flood
+        from one address cannot lock a victim's account faster than its own rate.
+        Without a client address (``ip`` None) only the account is checked:
+        one bucket for every caller would let a single client lock everyone out.
+        """
+        retry_after = self.backend.take(f"ip:{ip}", LOGIN_IP_BURST, LOGIN_IP_PER_MINUTE / 60) if ip else 0.0
+        if not retry_after:
+            retry_after = self.backend.take(
+                f"account:{account.strip().lower()[:255]}", LOGIN_ACCOUNT_BURST, LOGIN_ACCOUNT_PER_MINUTE / 60
+            )
+        if retry_after:
+            raise HTTPException(
+                status_code=429,
+                detail="Too many login attempts, try again later",
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+
+
+def is_trusted_proxy(address: str) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in TRUSTED_PROXIES)
+
+
+def client_ip(request: Request) -> str | None:
+    """The client address, or None if it is one of TRUSTED_PROXIES.
+
+    Starting from the peer, X-Forwarded-For is walked from the right while the
+    hop is a trusted proxy: the first other address is the client, entries left
+    of it are client-supplied. If every hop is trusted, the request comes from
+    inside (a proxy, a probe) and has no address to throttle.
+    """
+    address = request.client.host if request.client else None
+    forwarded = [a.strip() for a in request.headers.get("X-Forwarded-For", "").split(",") if a.strip()]
+    while address is not None and is_trusted_proxy(address):
+        address = forwarded.pop() if forwarded else None
+    return address
+
+
+login_throttle = LoginThrottle(
+    DatabaseBackend(engine) if LOGIN_THROTTLE_BACKEND == "database" else MemoryBackend(LOGIN_THROTTLE_MAX_KEYS)
+)
@@ -1,12 +1,14 @@
 import uuid
 from typing import Optional
 from sqlmodel import Session, select
+from app.core.outbox import record_user_change
 from app.core.security import get_password_hash, verify_password
 from app.models import User, UserCreate
 def create_user(*, session: Session, user_create: UserCreate) -> User:
     db_obj = User(email=user_create.email, full_name=user_create.full_name or None,
                   hashed_password=get_password_hash(user_create.password))
     session.add(db_obj)
+    record_user_change(session, db_obj)
     session.commit()
     session.refresh(db_obj)
     return db_obj
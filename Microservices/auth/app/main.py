@@ -1,10 +1,19 @@
+import time
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlmodel import SQLModel
-from app.api.routes import login  # ← CORRIGÉ
-from app.core.db import engine
+from app.api.routes import health, login  # ← CORRIGÉ
+from app.core.compression import CompressionMiddleware
+from app.core.db import dispose_engines, engine, replica_router
+from app.core.deadline import EXCEPTION_HANDLERS, DeadlineMiddleware
+from app.core.health import SHUTDOWN_DRAIN_SECONDS, prober
+from app.core.replicas import ReadYourWritesMiddleware
+from app.core.schema import DB_SCHEMA_MODE, prepare_database
+
+_import_seconds = time.perf_counter() - _import_started
 
-app = FastAPI(title="Auth Service")  # ← CORRIGÉ
+app = FastAPI(title="Auth Service", exception_handlers=EXCEPTION_HANDLERS)  # ← CORRIGÉ
 
 # CORS Configuration
 app.add_middleware(
@@ -14,10 +23,32 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ReadYourWritesMiddleware, router=replica_router)
+app.add_middleware(CompressionMiddleware)
+# Outermost, so the request budget starts when the request arrives.
+app.add_middleware(DeadlineMiddleware)
 
 app.include_router(login.router)  # ← CORRIGÉ
+app.include_router(health.router)
 
 @app.on_event("startup")
 def on_startup():
     print("Initializing database...")
-    SQLModel.metadata.create_all(engine)
\ No newline at end of file
+    started = time.perf_counter()
+    prepare_database(engine)
+    print(
+        f"Startup: imports {_import_seconds * 1000:.0f} ms, "
+        f"schema ({DB_SCHEMA_MODE}) {(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+    prober.start()
+
+@app.on_event("startup")
+async def drain_on_sigterm() -> None:
+    # async: signal handlers can only be set from the main (event loop) thread
+    prober.drain_on_sigterm(SHUTDOWN_DRAIN_SECONDS)
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    # uvicorn has already drained in-flight requests at this point.
+    prober.stop()
+    dispose_engines()
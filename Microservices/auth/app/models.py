@@ -1,5 +1,7 @@
 import uuid
+from datetime import datetime, timezone
 from pydantic import EmailStr
+from sqlalchemy import DateTime
 from sqlmodel import Field, SQLModel
 class UserBase(SQLModel):
     email: EmailStr = Field(index=True, max_length=255)
@@ -21,6 +23,25 @@ class User(SQLModel, table=True):
     is_active: bool = True
     is_superuser: bool = False
     full_name: str | None = Field(default=None, max_length=255)
+# Change stream of the user table for services keeping a local copy of it (items).
+# Rows are written in the same transaction as the user change; consumers follow seq.
+class UserOutbox(SQLModel, table=True):
+    __tablename__ = "user_outbox"
+    seq: int | None = Field(default=None, primary_key=True)
+    user_id: uuid.UUID = Field(index=True)
+    op: str = Field(max_length=16)  # upsert | delete
+    email: str | None = Field(default=None, max_length=255)
+    full_name: str | None = Field(default=None, max_length=255)
+    is_active: bool = False
+    is_superuser: bool = False
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), sa_type=DateTime(timezone=True))
+# Login token buckets shared by every pod (LOGIN_THROTTLE_BACKEND=database, app/core/throttle.py).
+class LoginThrottle(SQLModel, table=True):
+    __tablename__ = "login_throttle"
+    key: str = Field(primary_key=True, max_length=320)
+    tokens: float
+    allowed: bool = True
+    updated_at: datetime
 class UserPublic(SQLModel):
     id: uuid.UUID
     email: EmailStr
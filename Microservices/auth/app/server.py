@@ -0,0 +1,78 @@
+"""Production entrypoint: ``python -m app.server``.
+
+Runs uvicorn with one worker per CPU of the container quota (override with
+WEB_CONCURRENCY), uvloop and httptools when installed, and a graceful shutdown
+window (GRACEFUL_TIMEOUT seconds) to drain in-flight requests. In
+DB_SCHEMA_MODE=create the schema is created here, once, before the workers
+start; the workers then only check its version.
+"""
+import importlib.util
+import math
+import os
+
+import uvicorn
+
+
+def cpu_quota() -> int:
+    """CPUs available to this container: cgroup quota, else affinity mask."""
+    available = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    quota = period = None
+    try:
+        # cgroup v2: "<quota> <period>" or "max <period>"
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            raw_quota, raw_period = f.read().split()
+        if raw_quota != "max":
+            quota, period = int(raw_quota), int(raw_period)
+    except (OSError, ValueError):
+        try:
+            # cgroup v1: quota is -1 when unlimited
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+                quota = int(f.read())
+            with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+                period = int(f.read())
+        except (OSError, ValueError):
+            pass
+    if quota and period and quota > 0:
+        return max(1, min(available, math.ceil(quota / period)))
+    return max(1, available)
+
+
+def worker_count() -> int:
+    return int(os.getenv("WEB_CONCURRENCY") or cpu_quota())
+
+
+def prepare_schema() -> None:
+    from app.core.db import dispose_engines, engine
+    from app.core.schema import DB_SCHEMA_MODE, prepare_database
+
+    if DB_SCHEMA_MODE != "create":
+        return
+    prepare_database(engine)
+    dispose_engines()
+    # Spawned workers inherit the environment.
+    os.environ["DB_SCHEMA_MODE"] = "check"
+
+
+def main() -> None:
+    workers = worker_count()
+    # Spawned workers inherit it, e.g. for auth's choice of login throttle backend.
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    if workers > 1:
+        prepare_schema()
+    uvicorn.run(
+        "app.main:app",
+        host=os.getenv("HOST", "0.0.0.0"),
+        port=int(os.getenv("PORT", "8000")),
+        workers=workers,
+        loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+        http="httptools" if importlib.util.find_spec("httptools") else "h11",
+        timeout_graceful_shutdown=int(os.getenv("GRACEFUL_TIMEOUT", "20")),
+        # X-Forwarded-For is only believed from these proxies (Traefik pods,
+        # load balancer), walked from the right; "*" would let clients spoof it.
+        proxy_headers=True,
+        forwarded_allow_ips=os.getenv("TRUSTED_PROXIES", "127.0.0.1,::1,10.0.0.0/8,172.16.0.0/12,192.168.0.0/16"),
+    )
+
+
+if __name__ == "__main__":
+    main()
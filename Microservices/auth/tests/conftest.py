@@ -0,0 +1,31 @@
+"""Run from the service directory: ``python -m pytest tests``.
+
+Tests use a scratch SQLite database, or TEST_DATABASE_URL (an empty Postgres
+database) for the Postgres-only cases. Settings are read at import time, so the
+environment is set here before anything imports ``app``.
+"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/auth.db"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.core.db import engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+engine.echo = False
+
+requires_postgres = pytest.mark.skipif(
+    engine.dialect.name != "postgresql", reason="needs TEST_DATABASE_URL=postgresql://..."
+)
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
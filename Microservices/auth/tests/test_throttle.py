@@ -0,0 +1,103 @@
+import uuid
+
+import pytest
+from fastapi import HTTPException, Request
+
+from app.api.routes import login
+from app.core import throttle
+from app.core.db import engine
+from app.core.throttle import DatabaseBackend, LoginThrottle, MemoryBackend, client_ip
+from conftest import requires_postgres
+
+LOGIN = "/api/v1/login/access-token"
+
+
+class CountingBackend(MemoryBackend):
+    def __init__(self) -> None:
+        super().__init__(max_keys=100)
+        self.taken: list[str] = []
+
+    def take(self, key: str, burst: float, per_second: float) -> float:
+        self.taken.append(key)
+        return super().take(key, burst, per_second)
+
+
+def test_bucket_allows_the_burst_then_says_when_to_retry():
+    backend = MemoryBackend(max_keys=10)
+
+    assert [backend.take("k", 3, 0.5) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert backend.take("k", 3, 0.5) == pytest.approx(2, abs=0.01)
+
+
+def test_memory_backend_forgets_the_least_recently_used_key():
+    backend = MemoryBackend(max_keys=2)
+    backend.take("a", 1, 0.001)
+    backend.take("b", 1, 0.001)
+    backend.take("c", 1, 0.001)  # evicts a
+
+    assert backend.take("a", 1, 0.001) == 0.0
+    assert backend.take("c", 1, 0.001) > 0
+
+
+def test_account_is_not_charged_while_the_address_is_refused(monkeypatch):
+    monkeypatch.setattr(throttle, "LOGIN_IP_BURST", 2)
+    backend = CountingBackend()
+    login_throttle = LoginThrottle(backend)
+
+    for _ in range(2):
+        login_throttle.check("203.0.113.9", " Victim@Example.com")
+    with pytest.raises(HTTPException) as refused:
+        login_throttle.check("203.0.113.9", "victim@example.com")
+
+    assert refused.value.status_code == 429
+    assert int(refused.value.headers["Retry-After"]) >= 1
+    assert backend.taken.count("account:victim@example.com") == 2
+
+
+def test_login_flood_gets_429_before_any_password_check(client, monkeypatch):
+    monkeypatch.setattr(login, "login_throttle", LoginThrottle(MemoryBackend(max_keys=100)))
+    monkeypatch.setattr(throttle, "LOGIN_ACCOUNT_BURST", 3)
+    form = {"username": f"{uuid.uuid4().hex}@example.com", "password": "wrong-password"}
+
+    statuses = [client.post(LOGIN, data=form).status_code for _ in range(4)]
+
+    assert statuses == [400, 400, 400, 429]
+
+
+def request_from(peer: str, forwarded: str | None = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return Request({"type": "http", "client": (peer, 40000), "headers": headers})
+
+
+def test_client_ip_skips_trusted_proxies_from_the_right():
+    # Client-supplied spoof, the real client, then two proxies (load balancer, Traefik).
+    request = request_from("10.42.0.7", "1.2.3.4, 198.51.100.20, 10.0.3.9")
+
+    assert client_ip(request) == "198.51.100.20"
+
+
+def test_client_ip_ignores_forwarded_for_from_an_untrusted_peer():
+    assert client_ip(request_from("198.51.100.20", "1.2.3.4")) == "198.51.100.20"
+
+
+def test_client_ip_is_none_when_every_hop_is_a_proxy():
+    assert client_ip(request_from("10.42.0.7")) is None
+    assert client_ip(request_from("10.42.0.7", "10.0.3.9")) is None
+
+
+def test_without_an_address_only_the_account_is_charged():
+    backend = CountingBackend()
+
+    LoginThrottle(backend).check(None, "someone@example.com")
+
+    assert backend.taken == ["account:someone@example.com"]
+
+
+@requires_postgres
+def test_database_backend_shares_buckets_across_instances():
+    key = f"test:{uuid.uuid4()}"
+    first, second = DatabaseBackend(engine), DatabaseBackend(engine)
+
+    assert first.take(key, 2, 0.001) == 0.0
+    assert second.take(key, 2, 0.001) == 0.0
+    assert first.take(key, 2, 0.001) > 0
@@ -0,0 +1,114 @@
+"""CPU cost vs bytes saved of response compression on representative list pages.
+
+Serialises pages the way the routes do (ItemsPublic / UsersPublic, FastAPI's
+JSON encoding) and compresses them with every encoding the middleware can use
+here (zstd and br only when installed), at several levels. No database needed:
+
+    python benchmarks/bench_compression.py --iterations 500
+
+"saved KB/cpu ms" is the figure to compare: bytes kept off the wire for each
+millisecond of server CPU. Pages under COMPRESS_MIN_BYTES are never compressed.
+"""
+import argparse
+import importlib.util
+import json
+import random
+import sys
+import time
+import uuid
+import zlib
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "items"))
+
+from app.core.compression import COMPRESS_MIN_BYTES  # noqa: E402
+from app.models import ItemPublic, ItemsPublic  # noqa: E402
+
+WORDS = "order invoice draft shipment note review backlog task report meeting budget plan".split()
+
+
+def items_page(rows: int, described: float) -> bytes:
+    owner_id = uuid.uuid4()
+    page = ItemsPublic(
+        data=[
+            ItemPublic(
+                id=uuid.uuid4(),
+                owner_id=owner_id,
+                title=" ".join(random.choices(WORDS, k=3)),
+                description=" ".join(random.choices(WORDS, k=12)) if random.random() < described else None,
+            )
+            for _ in range(rows)
+        ],
+        count=rows * 7,
+    )
+    return page.model_dump_json().encode()
+
+
+def users_page(rows: int) -> bytes:
+    data = [
+        {
+            "id": str(uuid.uuid4()),
+            "email": f"{random.choice(WORDS)}.{n}@example.com",
+            "full_name": f"{random.choice(WORDS).title()} {random.choice(WORDS).title()}",
+            "is_active": True,
+            "is_superuser": False,
+        }
+        for n in range(rows)
+    ]
+    return json.dumps({"data": data, "count": rows * 3}, separators=(",", ":")).encode()
+
+
+def compressors() -> dict[str, Callable[[bytes], bytes]]:
+    found = {f"gzip-{level}": (lambda b, level=level: zlib.compress(b, level, wbits=31)) for level in (1, 5, 9)}
+    if importlib.util.find_spec("zstandard"):
+        import zstandard
+
+        for level in (1, 3, 9):
+            found[f"zstd-{level}"] = zstandard.ZstdCompressor(level=level).compress
+    if importlib.util.find_spec("brotli"):
+        import brotli
+
+        for quality in (1, 4, 9):
+            found[f"br-{quality}"] = lambda b, quality=quality: brotli.compress(b, quality=quality)
+    return found
+
+
+def measure(compress, body: bytes, iterations: int) -> tuple[int, float]:
+    size = len(compress(body))
+    cpu_started = time.process_time()
+    for _ in range(iterations):
+        compress(body)
+    return size, (time.process_time() - cpu_started) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    pages = {
+        "items x100": items_page(100, described=0.8),
+        "items x20 sparse": items_page(20, described=0.0),
+        "users x100": users_page(100),
+        "items x3": items_page(3, described=0.5),
+    }
+    encoders = compressors()
+    print(f"{'page':>17} {'bytes':>7} {'encoding':>8} {'out':>7} {'ratio':>6} {'cpu us':>8} {'saved KB/cpu ms':>16}")
+    for name, body in pages.items():
+        if len(body) < COMPRESS_MIN_BYTES:
+            print(f"{name:>17} {len(body):>7} {'(below COMPRESS_MIN_BYTES, sent as is)':>48}")
+            continue
+        for encoding, compress in encoders.items():
+            size, cpu = measure(compress, body, args.iterations)
+            saved = (len(body) - size) / 1024 / (cpu * 1000) if cpu else float("inf")
+            print(
+                f"{name:>17} {len(body):>7} {encoding:>8} {size:>7} {len(body) / size:>6.1f} "
+                f"{cpu * 1e6:>8.0f} {saved:>16.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Per-query latency and client CPU: psycopg2 vs psycopg 3 (prepared statements, pipeline).
+
+Runs the hot queries of the services the way the routes run them, one session
+per "request", against DATABASE_URL (Postgres; psycopg 3 must be installed):
+
+    DATABASE_URL=postgresql://... python benchmarks/bench_drivers.py --iterations 2000
+
+"cpu us" is client process CPU per query; Postgres-side parse/plan savings show
+up in the latency column (and in pg_stat_statements if it is enabled).
+"""
+import argparse
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "items"))
+
+from sqlmodel import Session, SQLModel, create_engine, delete, func, select  # noqa: E402
+
+from app.api.fields import select_columns  # noqa: E402
+from app.core.db import DATABASE_URL, connect_args, engine_url  # noqa: E402
+from app.core.pipeline import execute_pipelined  # noqa: E402
+from app.models import Item, ItemPublic, User  # noqa: E402
+
+
+def make_engine(driver: str):
+    url = engine_url(DATABASE_URL, driver)
+    return create_engine(url, connect_args=connect_args(url))
+
+
+def user_by_id(session: Session, user: User) -> None:
+    # get_current_user
+    session.get(User, user.id)
+
+
+def user_by_email(session: Session, user: User) -> None:
+    # auth crud.get_user_by_email
+    session.exec(select(User).where(User.email == user.email)).first()
+
+
+def list_sequential(session: Session, user: User) -> None:
+    # list_my_items before pipelining: count, then the page
+    session.exec(select(func.count()).select_from(Item).where(Item.owner_id == user.id)).one()
+    session.execute(select_columns(Item, list(ItemPublic.model_fields)).where(Item.owner_id == user.id).limit(100)).all()
+
+
+def list_pipelined(session: Session, user: User) -> None:
+    execute_pipelined(
+        session,
+        select(func.count()).select_from(Item).where(Item.owner_id == user.id),
+        select_columns(Item, list(ItemPublic.model_fields)).where(Item.owner_id == user.id).limit(100),
+    )
+
+
+QUERIES = {
+    "user by id": user_by_id,
+    "user by email": user_by_email,
+    "list + count": list_sequential,
+    "list + count (pipelined)": list_pipelined,
+}
+
+
+def measure(engine, query, user: User, iterations: int) -> tuple[list[float], float]:
+    for _ in range(20):  # fill the pool, pass the prepare threshold
+        with Session(engine) as session:
+            query(session, user)
+    latencies = []
+    cpu_started = time.process_time()
+    for _ in range(iterations):
+        started = time.perf_counter()
+        with Session(engine) as session:
+            query(session, user)
+        latencies.append(time.perf_counter() - started)
+    return latencies, (time.process_time() - cpu_started) / iterations
+
+
+def percentile(values: list[float], pct: float) -> float:
+    return statistics.quantiles(values, n=100)[int(pct) - 1] * 1000 if len(values) > 1 else values[0] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--items", type=int, default=500, help="items owned by the benchmark user")
+    args = parser.parse_args()
+
+    engines = {driver: make_engine(driver) for driver in ("psycopg2", "psycopg")}
+    setup = engines["psycopg2"]
+    if setup.dialect.name != "postgresql":
+        sys.exit("bench_drivers needs Postgres (DATABASE_URL=postgresql://...)")
+    SQLModel.metadata.create_all(setup, tables=[User.__table__, Item.__table__])
+    user_id = uuid.uuid4()
+    user = User(id=user_id, email=f"bench-{user_id.hex[:12]}@example.com", hashed_password="x")
+    with Session(setup) as session:
+        session.add(user)
+        session.commit()
+        session.add_all(Item(title=f"bench {n}", owner_id=user_id) for n in range(args.items))
+        session.commit()
+        session.refresh(user)
+
+    print(f"{'query':>26} {'driver':>9} {'p50 ms':>8} {'p99 ms':>8} {'cpu us':>8}")
+    try:
+        for name, query in QUERIES.items():
+            for driver, engine in engines.items():
+                latencies, cpu = measure(engine, query, user, args.iterations)
+                print(
+                    f"{name:>26} {driver:>9} {percentile(latencies, 50):>8.3f} "
+                    f"{percentile(latencies, 99):>8.3f} {cpu * 1e6:>8.0f}"
+                )
+    finally:
+        with Session(setup) as session:
+            session.exec(delete(Item).where(Item.owner_id == user_id))
+            session.exec(delete(User).where(User.id == user_id))
+            session.commit()
+        for engine in engines.values():
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Item insert throughput and latency: one commit per item vs group commit.
+
+Runs against DATABASE_URL (use a real Postgres to see the fsync savings):
+
+    DATABASE_URL=postgresql://... python benchmarks/bench_group_commit.py --concurrency 1 8 32 128
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "items"))
+
+from sqlmodel import Session, SQLModel, delete  # noqa: E402
+
+from app.core.db import engine  # noqa: E402
+from app.core.group_commit import GroupCommitter  # noqa: E402
+from app.models import Item, ItemPublic, User  # noqa: E402
+
+
+def insert_single(owner_id: uuid.UUID, title: str) -> None:
+    # What create_item does without group commit.
+    with Session(engine) as session:
+        item = Item(title=title, owner_id=owner_id)
+        session.add(item)
+        session.commit()
+        session.refresh(item)
+        ItemPublic.model_validate(item)
+
+
+def run(insert, owner_id: uuid.UUID, concurrency: int, per_thread: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    lock = threading.Lock()
+
+    def worker() -> None:
+        local = []
+        for n in range(per_thread):
+            started = time.perf_counter()
+            insert(owner_id, f"bench {n}")
+            local.append(time.perf_counter() - started)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+    return len(latencies) / elapsed, latencies
+
+
+def percentile(values: list[float], pct: float) -> float:
+    return statistics.quantiles(values, n=100)[int(pct) - 1] * 1000 if len(values) > 1 else values[0] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    parser.add_argument("--per-thread", type=int, default=50)
+    parser.add_argument("--window-ms", type=float, default=5.0)
+    parser.add_argument("--max-batch", type=int, default=100)
+    args = parser.parse_args()
+
+    engine.echo = False
+    SQLModel.metadata.create_all(engine)
+    owner_id = uuid.uuid4()
+    with Session(engine) as session:
+        session.add(User(id=owner_id, email=f"bench-{owner_id.hex[:12]}@example.com", hashed_password="x"))
+        session.commit()
+
+    committer = GroupCommitter(engine, window=args.window_ms / 1000, max_batch=args.max_batch)
+    def group(owner_id: uuid.UUID, title: str) -> None:
+        committer.submit({"title": title, "description": None, "owner_id": owner_id})
+
+    print(f"{'mode':>8} {'conc':>5} {'items/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    try:
+        for concurrency in args.concurrency:
+            for mode, insert in (("single", insert_single), ("group", group)):
+                rate, latencies = run(insert, owner_id, concurrency, args.per_thread)
+                print(
+                    f"{mode:>8} {concurrency:>5} {rate:>9.0f} "
+                    f"{percentile(latencies, 50):>8.2f} {percentile(latencies, 99):>8.2f}"
+                )
+    finally:
+        committer.stop()
+        with Session(engine) as session:
+            session.exec(delete(Item).where(Item.owner_id == owner_id))
+            session.exec(delete(User).where(User.id == owner_id))
+            session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Item latency at data volume: one heap vs hash partitions on owner_id.
+
+Loads the same rows (default 10M, owner sizes skewed so a few tenants are very
+large) into a plain table and a hash-partitioned one, then times the queries
+the item routes run. Needs Postgres; the tables live in a scratch schema:
+
+    DATABASE_URL=postgresql://... python benchmarks/bench_partitioning.py --rows 10000000 --partitions 16
+
+Loading 10M rows twice takes a while; pass --keep to reuse the tables between runs.
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "items"))
+
+from sqlalchemy import text  # noqa: E402
+
+from app.core.db import engine  # noqa: E402
+
+SCHEMA = "bench_partitioning"
+
+# Same shape and keys as the item table with and without ITEM_PARTITIONS.
+PLAIN_DDL = [
+    f"""CREATE TABLE {SCHEMA}.item_plain (
+        id UUID PRIMARY KEY, owner_id UUID NOT NULL,
+        title VARCHAR(255) NOT NULL, description VARCHAR(255))""",
+]
+PARTITIONED_DDL = [
+    f"""CREATE TABLE {SCHEMA}.item_hash (
+        id UUID NOT NULL, owner_id UUID NOT NULL,
+        title VARCHAR(255) NOT NULL, description VARCHAR(255),
+        PRIMARY KEY (owner_id, id)) PARTITION BY HASH (owner_id)""",
+]
+# Indexes are built after loading, which is much faster than maintaining them row by row.
+INDEXES = {
+    "item_plain": [f"CREATE INDEX ON {SCHEMA}.item_plain (owner_id, id)"],
+    "item_hash": [f"CREATE INDEX ON {SCHEMA}.item_hash (id)"],
+}
+
+# owner = floor(owners * random()^3): a long tail of small owners and a few huge ones.
+LOAD = """
+INSERT INTO {table} (id, owner_id, title, description)
+SELECT gen_random_uuid(),
+       ('00000000-0000-0000-0000-' || lpad(to_hex(floor({owners} * random() ^ 3)::int), 12, '0'))::uuid,
+       'item ' || g, CASE WHEN g % 2 = 0 THEN 'description ' || g END
+FROM generate_series(1, {rows}) AS g
+"""
+
+QUERIES = {
+    # list_my_items: count + first page
+    "list": [
+        "SELECT count(*) FROM {table} WHERE owner_id = :owner",
+        "SELECT id, owner_id, title, description FROM {table} WHERE owner_id = :owner ORDER BY id LIMIT 100",
+    ],
+    # get/update/delete as a regular user: id and owner
+    "get": ["SELECT id, owner_id, title, description FROM {table} WHERE id = :id AND owner_id = :owner"],
+    # get/delete as a superuser: id only
+    "get by id": ["SELECT id, owner_id, title, description FROM {table} WHERE id = :id"],
+    # one chunk of the background user deletion (rolled back)
+    "delete chunk": [
+        "DELETE FROM {table} WHERE owner_id = :owner AND id IN "
+        "(SELECT id FROM {table} WHERE owner_id = :owner LIMIT 500)"
+    ],
+}
+
+
+def setup(rows: int, owners: int, partitions: int, keep: bool) -> None:
+    with engine.begin() as conn:
+        exists = conn.execute(text(f"SELECT to_regclass('{SCHEMA}.item_hash') IS NOT NULL")).scalar()
+        if exists and keep:
+            return
+        conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+        conn.exec_driver_sql(f"CREATE SCHEMA {SCHEMA}")
+        for statement in PLAIN_DDL + PARTITIONED_DDL:
+            conn.exec_driver_sql(statement)
+        for remainder in range(partitions):
+            conn.exec_driver_sql(
+                f"CREATE TABLE {SCHEMA}.item_hash_p{remainder} PARTITION OF {SCHEMA}.item_hash "
+                f"FOR VALUES WITH (MODULUS {partitions}, REMAINDER {remainder})"
+            )
+    for table in ("item_plain", "item_hash"):
+        started = time.perf_counter()
+        with engine.begin() as conn:
+            conn.exec_driver_sql("SELECT setseed(0.42)")
+            conn.exec_driver_sql(LOAD.format(table=f"{SCHEMA}.{table}", owners=owners, rows=rows))
+            for statement in INDEXES[table]:
+                conn.exec_driver_sql(statement)
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+            conn.exec_driver_sql(f"VACUUM ANALYZE {SCHEMA}.{table}")
+        print(f"loaded {rows} rows into {table} in {time.perf_counter() - started:.0f} s")
+
+
+def sample(table: str, n: int) -> list[dict]:
+    # Half from the largest owners, half at random, so both tenant sizes are measured.
+    with engine.connect() as conn:
+        big = conn.execute(text(
+            f"SELECT owner_id FROM {SCHEMA}.{table} GROUP BY owner_id ORDER BY count(*) DESC LIMIT 5"
+        )).scalars().all()
+        rows = conn.execute(text(
+            f"SELECT id, owner_id FROM {SCHEMA}.{table} TABLESAMPLE SYSTEM (1) "
+            "WHERE owner_id = ANY(:big) LIMIT :n"
+        ), {"big": list(big), "n": n // 2}).all()
+        rows += conn.execute(text(
+            f"SELECT id, owner_id FROM {SCHEMA}.{table} TABLESAMPLE SYSTEM (1) LIMIT :n"
+        ), {"n": n - len(rows)}).all()
+    picks = [{"id": r.id, "owner": r.owner_id} for r in rows]
+    random.shuffle(picks)
+    return picks
+
+
+def measure(table: str, statements: list[str], params: list[dict]) -> list[float]:
+    statements = [text(statement.format(table=f"{SCHEMA}.{table}")) for statement in statements]
+    latencies = []
+    with engine.connect() as conn:
+        for p in params:
+            started = time.perf_counter()
+            for statement in statements:
+                result = conn.execute(statement, p)
+                if result.returns_rows:
+                    result.all()
+            latencies.append(time.perf_counter() - started)
+            conn.rollback()
+    return latencies
+
+
+def percentile(values: list[float], pct: float) -> float:
+    return statistics.quantiles(values, n=100)[int(pct) - 1] * 1000 if len(values) > 1 else values[0] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--owners", type=int, default=10_000)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--samples", type=int, default=200)
+    parser.add_argument("--keep", action="store_true", help="reuse loaded tables, keep them afterwards")
+    args = parser.parse_args()
+
+    engine.echo = False
+    if engine.dialect.name != "postgresql":
+        sys.exit("bench_partitioning needs Postgres (DATABASE_URL=postgresql://...)")
+    random.seed(42)
+    setup(args.rows, args.owners, args.partitions, args.keep)
+    try:
+        # ids are random per table: each table is sampled on its own
+        params = {table: sample(table, args.samples) for table in ("item_plain", "item_hash")}
+        print(f"{'query':>13} {'table':>11} {'p50 ms':>8} {'p99 ms':>8}")
+        for name, statements in QUERIES.items():
+            for table in ("item_plain", "item_hash"):
+                measure(table, statements, params[table][:10])  # warm the cache
+                latencies = measure(table, statements, params[table])
+                print(f"{name:>13} {table:>11} {percentile(latencies, 50):>8.2f} {percentile(latencies, 99):>8.2f}")
+    finally:
+        if not args.keep:
+            with engine.begin() as conn:
+                conn.exec_driver_sql(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Requests/sec of one service as the worker count grows.
+
+Starts ``python -m app.server`` in the given service directory once per worker
+count and hammers one endpoint with keep-alive clients in separate processes.
+
+    python benchmarks/bench_workers.py --service auth --path /health --workers 1 2 4
+"""
+import argparse
+import http.client
+import multiprocessing
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+
+def client(port: int, path: str, duration: float, results) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    done = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        conn.request("GET", path)
+        conn.getresponse().read()
+        done += 1
+    results.put(done)
+
+
+def wait_ready(port: int, path: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            conn.request("GET", path)
+            if conn.getresponse().status < 500:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("server did not become ready")
+
+
+def run(service_dir: Path, workers: int, port: int, path: str, clients: int, duration: float) -> float:
+    env = {**os.environ, "WEB_CONCURRENCY": str(workers), "PORT": str(port), "HOST": "127.0.0.1"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server"], cwd=service_dir, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(port, path)
+        results = multiprocessing.Queue()
+        procs = [multiprocessing.Process(target=client, args=(port, path, duration, results)) for _ in range(clients)]
+        for p in procs:
+            p.start()
+        total = sum(results.get() for _ in procs)
+        for p in procs:
+            p.join()
+        return total / duration
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--service", default="auth")
+    parser.add_argument("--path", default="/health")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--clients", type=int, default=(os.cpu_count() or 2) * 2)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    service_dir = Path(__file__).resolve().parent.parent / args.service
+    baseline = None
+    print(f"{'workers':>8} {'req/s':>10} {'speedup':>8}")
+    for workers in args.workers:
+        rps = run(service_dir, workers, args.port, args.path, args.clients, args.duration)
+        baseline = baseline or rps
+        print(f"{workers:>8} {rps:>10.0f} {rps / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""Token verify latency and auth CPU while a login flood is running.
+
+Starts ``python -m app.server`` for auth, measures /auth/verify latency alone,
+then again while flood processes post wrong passwords for real accounts from a
+few client addresses (X-Forwarded-For). Run it once with throttling and once
+with it effectively off to compare:
+
+    python benchmarks/load_login_flood.py
+    LOGIN_IP_BURST=1e9 LOGIN_ACCOUNT_BURST=1e9 python benchmarks/load_login_flood.py
+
+DATABASE_URL and LOGIN_* settings are passed through to the server.
+"""
+import argparse
+import http.client
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import time
+import urllib.parse
+import uuid
+from pathlib import Path
+
+API = "/api/v1"
+
+
+def request(conn: http.client.HTTPConnection, method: str, path: str, body: str | None = None, headers=None):
+    conn.request(method, path, body=body, headers=headers or {})
+    response = conn.getresponse()
+    return response.status, response.read()
+
+
+def wait_ready(port: int, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            if request(conn, "GET", "/health/live")[0] == 200:
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError("auth did not become ready")
+
+
+def login_form(email: str, password: str) -> str:
+    return urllib.parse.urlencode({"username": email, "password": password})
+
+
+def flood(port: int, accounts: list[str], addresses: int, stop, results) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    statuses: dict[int, int] = {}
+    n = 0
+    while not stop.is_set():
+        headers = {
+            "Content-Type": "application/x-www-form-urlencoded",
+            "X-Forwarded-For": f"203.0.113.{n % addresses + 1}",
+        }
+        body = login_form(accounts[n % len(accounts)], "wrong")
+        status, _ = request(conn, "POST", f"{API}/login/access-token", body, headers)
+        statuses[status] = statuses.get(status, 0) + 1
+        n += 1
+    results.put(statuses)
+
+
+def verify_latencies(port: int, token: str, duration: float) -> list[float]:
+    conn = http.client.HTTPConnection("127.0.0.1", port)
+    headers = {"Authorization": f"Bearer {token}"}
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        request(conn, "GET", f"{API}/auth/verify", headers=headers)
+        latencies.append(time.perf_counter() - started)
+        time.sleep(0.005)
+    return latencies
+
+
+def cpu_seconds(pid: int) -> float:
+    """utime + stime of a process and all its descendants (Linux /proc)."""
+    parents: dict[int, int] = {}
+    times: dict[int, float] = {}
+    tick = os.sysconf("SC_CLK_TCK")
+    for entry in Path("/proc").iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            fields = (entry / "stat").read_text().rsplit(")", 1)[1].split()
+        except OSError:
+            continue
+        parents[int(entry.name)] = int(fields[1])
+        times[int(entry.name)] = (int(fields[11]) + int(fields[12])) / tick
+    tree, frontier = {pid}, [pid]
+    while frontier:
+        parent = frontier.pop()
+        for child, ppid in parents.items():
+            if ppid == parent and child not in tree:
+                tree.add(child)
+                frontier.append(child)
+    return sum(times.get(p, 0.0) for p in tree)
+
+
+def percentile(values: list[float], pct: float) -> float:
+    return statistics.quantiles(values, n=100)[int(pct) - 1] * 1000 if len(values) > 1 else values[0] * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--flooders", type=int, default=(os.cpu_count() or 2) * 2)
+    parser.add_argument("--accounts", type=int, default=3, help="real accounts the flood targets")
+    parser.add_argument("--addresses", type=int, default=4, help="client addresses the flood comes from")
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    service_dir = Path(__file__).resolve().parent.parent / "auth"
+    env = {**os.environ, "WEB_CONCURRENCY": str(args.workers), "PORT": str(args.port), "HOST": "127.0.0.1"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "app.server"], cwd=service_dir, env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_ready(args.port)
+        conn = http.client.HTTPConnection("127.0.0.1", args.port)
+        run = uuid.uuid4().hex[:8]
+        accounts = [f"flood-{run}-{n}@example.com" for n in range(args.accounts)]
+        for n, email in enumerate(accounts):
+            # other addresses than the flood's, so setting up does not use its buckets
+            request(conn, "POST", f"{API}/users/", json.dumps({"email": email, "password": "correct-horse"}),
+                    {"Content-Type": "application/json", "X-Forwarded-For": f"198.51.100.{n + 1}"})
+        _, body = request(conn, "POST", f"{API}/login/access-token", login_form(accounts[0], "correct-horse"),
+                          {"Content-Type": "application/x-www-form-urlencoded", "X-Forwarded-For": "198.51.100.251"})
+        token = json.loads(body)["access_token"]
+
+        print(f"{'phase':>8} {'verify p50 ms':>14} {'verify p99 ms':>14} {'auth cpu %':>11}")
+        for phase in ("idle", "flood"):
+            stop = multiprocessing.Event()
+            results = multiprocessing.Queue()
+            flooders = [
+                multiprocessing.Process(target=flood, args=(args.port, accounts, args.addresses, stop, results))
+                for _ in range(args.flooders if phase == "flood" else 0)
+            ]
+            for p in flooders:
+                p.start()
+            cpu_started, started = cpu_seconds(server.pid), time.perf_counter()
+            latencies = verify_latencies(args.port, token, args.duration)
+            cpu = (cpu_seconds(server.pid) - cpu_started) / (time.perf_counter() - started) * 100
+            stop.set()
+            statuses: dict[int, int] = {}
+            for _ in flooders:
+                for status, count in results.get().items():
+                    statuses[status] = statuses.get(status, 0) + count
+            for p in flooders:
+                p.join()
+            print(f"{phase:>8} {percentile(latencies, 50):>14.2f} {percentile(latencies, 99):>14.2f} {cpu:>11.0f}")
+            if statuses:
+                print(f"{'':>8} flood responses: " + ", ".join(f"{s}: {c}" for s, c in sorted(statuses.items())))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
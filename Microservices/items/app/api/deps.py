@@ -3,25 +3,55 @@ from typing import Annotated
 import uuid
 import jwt
 from jwt import PyJWTError
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from pydantic import ValidationError
 from sqlmodel import Session
 
 from app.core.config import settings
-from app.core.db import engine
-from app.models import TokenPayload, User
+from app.core.db import engine, replica_router
+from app.core.deadline import bind_deadline, request_deadline
+from app.core.replicas import READ_METHODS, read_primary_until
+from app.models import SHARED_USER_TABLE, Principal, TokenPayload, User
 
 reusable_oauth2 = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_STR}/login/access-token")
 
-def get_db() -> Generator[Session, None, None]:
+
+def request_principal(request: Request) -> str | None:
+    # Routing hint only (never used for authorization): the user id forwarded by
+    # Traefik ForwardAuth, else the subject of the bearer token.
+    user_id = request.headers.get("X-User-Id")
+    if user_id:
+        return user_id
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"]).get("sub")
+    except PyJWTError:
+        return None
+
+def get_db(request: Request) -> Generator[Session, None, None]:
+    principal = request_principal(request)
+    # Queries run with a statement_timeout of what is left of the request budget.
+    deadline = request_deadline(request)
+    if request.method in READ_METHODS:
+        with Session(replica_router.engine_for_read(principal, read_primary_until(request))) as session:
+            bind_deadline(session, deadline)
+            yield session
+        return
+    # Writes go to the primary; the principal then reads from the primary until
+    # replicas have caught up (read-your-writes).
+    replica_router.mark_write(principal)
     with Session(engine) as session:
+        bind_deadline(session, deadline)
         yield session
+    replica_router.mark_write(principal)
 
 SessionDep = Annotated[Session, Depends(get_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+def user_id_from_token(token: str) -> uuid.UUID:
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
         token_data = TokenPayload(**payload)
@@ -32,18 +62,46 @@ def get_current_user(session: SessionDep, token: TokenDep) -> User:
         raise HTTPException(status_code=403, detail="Invalid token")
 
     try:
-        user_id = uuid.UUID(token_data.sub)
+        return uuid.UUID(token_data.sub)
     except ValueError:
         raise HTTPException(status_code=403, detail="Invalid subject in token")
 
+def get_current_user(session: SessionDep, token: TokenDep) -> User | Principal:
+    user_id = user_id_from_token(token)
+    if not SHARED_USER_TABLE:
+        principal = session.get(Principal, user_id)
+        if principal is None:
+            # Not replicated yet (just registered, or a fresh deployment still
+            # backfilling): the signed token is enough for a regular user;
+            # superuser rights need the replicated record. A deleted user
+            # becomes an inactive tombstone and is refused below.
+            return Principal(id=user_id)
+        if not principal.is_active:
+            raise HTTPException(status_code=403, detail="Inactive user")
+        return principal
     user = session.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    if not user.is_active:
+        # Deactivated, or scheduled for deletion: no new items.
+        raise HTTPException(status_code=403, detail="Inactive user")
     return user
 
-CurrentUser = Annotated[User, Depends(get_current_user)]
+CurrentUser = Annotated[User | Principal, Depends(get_current_user)]
 
-def get_current_active_superuser(current_user: CurrentUser) -> User:
+def get_current_active_superuser(current_user: CurrentUser) -> User | Principal:
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough privileges")
     return current_user
+
+def get_stream_user_id(request: Request) -> uuid.UUID:
+    # Long-lived streams authenticate from the token alone so they never hold a DB
+    # connection. EventSource cannot send headers, hence the ?access_token= fallback.
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        token = request.query_params.get("access_token", "")
+    if not token:
+        raise HTTPException(status_code=401, detail="Not authenticated", headers={"WWW-Authenticate": "Bearer"})
+    return user_id_from_token(token)
+
+StreamUserId = Annotated[uuid.UUID, Depends(get_stream_user_id)]
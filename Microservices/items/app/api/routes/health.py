@@ -0,0 +1,27 @@
+from typing import Any
+
+from fastapi import APIRouter, Response
+
+from app.core.health import prober
+from app.core.principals import PRINCIPALS_REPLICATED, principal_sync
+
+router = APIRouter(prefix="/health", tags=["health"])
+
+SERVICE = "items"
+
+# Both probes only read memory; the DB check runs in the background prober.
+@router.get("/live")
+async def live() -> Any:
+    return {"status": "alive", "service": SERVICE}
+
+@router.get("/ready")
+async def ready(response: Response) -> Any:
+    is_ready, report = prober.readiness()
+    if not is_ready:
+        response.status_code = 503
+    return {"status": "ready" if is_ready else "not ready", "service": SERVICE, **report}
+
+# Lag of the local principal copy behind the user outbox (replicated mode only).
+@router.get("/principal-sync")
+async def principal_sync_status() -> Any:
+    return {"mode": "replicated" if PRINCIPALS_REPLICATED else "shared", **principal_sync.status}
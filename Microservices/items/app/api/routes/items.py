@@ -1,44 +1,181 @@
+import asyncio
+import json
 import uuid
-from typing import Any
+from typing import Any, Literal
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlmodel import select, func
 
-from app.api.deps import SessionDep, CurrentUser, get_current_active_superuser
-from app.models import Item, ItemCreate, ItemUpdate, ItemPublic, ItemsPublic, Message
+from app.api.deps import SessionDep, CurrentUser, StreamUserId, get_current_active_superuser
+from app.api.fields import parse_fields, row_dict, select_columns, sparse_response
+from app.core.deadline import request_timeout
+from app.core.changes import change_feed
+from app.core.group_commit import GROUP_COMMIT_ENABLED, group_committer
+from app.core.pipeline import execute_pipelined
+from app.models import SHARED_USER_TABLE, Item, Principal, User, ItemCreate, ItemUpdate, ItemPublic, ItemsPublic, ItemSearchResults, Message
+from app import search
 
 router = APIRouter(prefix="/items", tags=["items"])
 
 @router.post("/", response_model=ItemPublic)
 def create_item(session: SessionDep, current_user: CurrentUser, item_in: ItemCreate) -> Any:
+    if GROUP_COMMIT_ENABLED:
+        values = {**item_in.model_dump(), "owner_id": current_user.id}
+        # Give the connection get_current_user used back to the pool before
+        # waiting: the writer thread needs one from the same pool.
+        session.close()
+        return group_committer.submit(values, session.info.get("deadline"))
     item = Item(**item_in.model_dump(), owner_id=current_user.id)
     session.add(item)
     session.commit()
     session.refresh(item)
     return ItemPublic.model_validate(item)
 
+# Owner fields joined into list rows by expand=owner, from the shared user table
+# or from the local principal copy when items runs on its own database.
+OWNER_FIELDS = ["id", "email", "full_name"]
+Owner = User if SHARED_USER_TABLE else Principal
+
 @router.get("/", response_model=ItemsPublic)
-def list_my_items(session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100) -> Any:
-    items = session.exec(
-        select(Item).where(Item.owner_id == current_user.id).offset(skip).limit(limit)
-    ).all()
-    count = session.exec(
-        select(func.count()).select_from(select(Item).where(Item.owner_id == current_user.id).subquery())
-    ).one()
-    data = [ItemPublic.model_validate(i) for i in items]
-    return ItemsPublic(data=data, count=count)
+@request_timeout(5)
+def list_my_items(
+    session: SessionDep,
+    current_user: CurrentUser,
+    skip: int = 0,
+    limit: int = 100,
+    fields: str | None = None,
+    expand: Literal["owner"] | None = None,
+) -> Any:
+    selected = parse_fields(fields, ItemPublic.model_fields)
+    names = selected or list(ItemPublic.model_fields)
+    statement = select_columns(Item, names).where(Item.owner_id == current_user.id)
+    if expand == "owner":
+        # one statement: owner columns come from a join, not a request per item.
+        # Outer: an owner not replicated yet still lists its items, with owner null.
+        statement = statement.outerjoin(Owner, Owner.id == Item.owner_id).add_columns(
+            *(getattr(Owner, f) for f in OWNER_FIELDS)
+        )
+    counts, rows = execute_pipelined(
+        session,
+        select(func.count()).select_from(Item).where(Item.owner_id == current_user.id),
+        statement.offset(skip).limit(limit),
+    )
+    count = counts[0][0]
+    data = [row_dict(names, r) for r in rows]
+    if expand == "owner":
+        for item, row in zip(data, rows):
+            owner = row_dict(OWNER_FIELDS, row[len(names):])
+            item["owner"] = owner if owner["id"] is not None else None
+    if selected or expand:
+        return sparse_response({"data": data, "count": count})
+    return ItemsPublic(data=[ItemPublic(**item) for item in data], count=count)
+
+SSE_KEEPALIVE_SECONDS = 15
+
+def sse_change(change: dict[str, Any]) -> str:
+    return f"id: {change['seq']}\nevent: change\ndata: {json.dumps(change, separators=(',', ':'))}\n\n"
+
+# Tells the client it may have missed changes and must refetch its list.
+SSE_RESET = "event: reset\ndata: {}\n\n"
+
+# Declared before /{item_id} so "changes" is not parsed as an item id.
+@router.get("/changes")
+async def item_changes(
+    user_id: StreamUserId,
+    since: int | None = None,
+    last_event_id: str | None = Header(default=None),
+) -> StreamingResponse:
+    """Server-Sent Events feed of the caller's item changes.
+
+    Resume with ``since`` or the ``Last-Event-ID`` header sent by EventSource on
+    reconnect. A ``reset`` event means changes may have been missed.
+    """
+    if since is None and last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+
+    async def stream():
+        subscription = change_feed.subscribe(user_id)
+        # Subscribed before replaying, so a change can arrive twice; skip the repeats.
+        replayed: set[int] = set()
+        try:
+            yield "retry: 3000\n\n"
+            if since is not None:
+                backlog = change_feed.replay(user_id, since)
+                if backlog is None:
+                    yield SSE_RESET
+                for change in backlog or ():
+                    replayed.add(change["seq"])
+                    yield sse_change(change)
+            while True:
+                try:
+                    await asyncio.wait_for(subscription.ready.wait(), SSE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                subscription.ready.clear()
+                if subscription.overflowed:
+                    subscription.overflowed = False
+                    yield SSE_RESET
+                while subscription.events:
+                    change = subscription.events.popleft()
+                    if change["seq"] not in replayed:
+                        yield sse_change(change)
+        finally:
+            change_feed.unsubscribe(subscription)
+
+    return StreamingResponse(
+        stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+# Declared before /{item_id} so "search" is not parsed as an item id.
+@router.get("/search", response_model=ItemSearchResults)
+@request_timeout(5)
+def search_my_items(
+    session: SessionDep,
+    current_user: CurrentUser,
+    q: str = Query(min_length=1, max_length=255),
+    limit: int = Query(default=20, ge=1, le=100),
+    cursor: str | None = None,
+) -> Any:
+    try:
+        data, next_cursor = search.search_items(
+            session=session, owner_id=current_user.id, q=q, limit=limit, cursor=cursor
+        )
+    except search.InvalidCursor:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return ItemSearchResults(data=data, next_cursor=next_cursor)
+
+def owned_item(session: SessionDep, current_user: CurrentUser, item_id: uuid.UUID, *, any_owner: bool = False) -> Item | None:
+    # Filtering on owner_id as well lets a partitioned item table probe only the owner's partition.
+    statement = select(Item).where(Item.id == item_id)
+    if not any_owner:
+        statement = statement.where(Item.owner_id == current_user.id)
+    return session.exec(statement).first()
 
 @router.get("/{item_id}", response_model=ItemPublic)
-def get_item(session: SessionDep, current_user: CurrentUser, item_id: uuid.UUID) -> Any:
-    item = session.get(Item, item_id)
-    if not item or (not current_user.is_superuser and item.owner_id != current_user.id):
+def get_item(session: SessionDep, current_user: CurrentUser, item_id: uuid.UUID, fields: str | None = None) -> Any:
+    selected = parse_fields(fields, ItemPublic.model_fields)
+    if selected:
+        # Access is checked in the WHERE clause, so owner_id need not be selected.
+        statement = select_columns(Item, selected).where(Item.id == item_id)
+        if not current_user.is_superuser:
+            statement = statement.where(Item.owner_id == current_user.id)
+        row = session.exec(statement).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="Item not found")
+        return sparse_response(row_dict(selected, row))
+    item = owned_item(session, current_user, item_id, any_owner=current_user.is_superuser)
+    if not item:
         raise HTTPException(status_code=404, detail="Item not found")
     return ItemPublic.model_validate(item)
 
 @router.put("/{item_id}", response_model=ItemPublic)
 def update_item(session: SessionDep, current_user: CurrentUser, item_id: uuid.UUID, item_in: ItemUpdate) -> Any:
-    item = session.get(Item, item_id)
-    if not item or item.owner_id != current_user.id:
+    item = owned_item(session, current_user, item_id)
+    if not item:
         raise HTTPException(status_code=404, detail="Item not found")
     update_data = item_in.model_dump(exclude_unset=True)
     for k, v in update_data.items():
@@ -50,8 +187,8 @@ def update_item(session: SessionDep, current_user: CurrentUser, item_id: uuid.UU
 
 @router.delete("/{item_id}", response_model=Message)
 def delete_item(session: SessionDep, current_user: CurrentUser, item_id: uuid.UUID) -> Any:
-    item = session.get(Item, item_id)
-    if not item or (not current_user.is_superuser and item.owner_id != current_user.id):
+    item = owned_item(session, current_user, item_id, any_owner=current_user.is_superuser)
+    if not item:
         raise HTTPException(status_code=404, detail="Item not found")
     session.delete(item)
     session.commit()
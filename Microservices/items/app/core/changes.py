@@ -0,0 +1,213 @@
+import asyncio
+import itertools
+import json
+import logging
+import os
+import uuid
+from collections import defaultdict, deque
+from typing import Any
+
+from sqlalchemy import Connection, Engine, event, text
+
+from app.core.db import engine
+from app.models import Item
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "item_changes"
+CHANGE_FEED_BUFFER_SIZE = int(os.getenv("CHANGE_FEED_BUFFER_SIZE", "2000"))
+CHANGE_FEED_QUEUE_SIZE = int(os.getenv("CHANGE_FEED_QUEUE_SIZE", "100"))
+CHANGE_FEED_CONNECT_TIMEOUT_SECONDS = int(os.getenv("CHANGE_FEED_CONNECT_TIMEOUT_SECONDS", "5"))
+
+# seq comes from a shared sequence so resume tokens are valid on every pod. It
+# names a change but does not order changes: nextval() runs at write time while
+# NOTIFY delivers in commit order (the same order on every pod). The binds are
+# cast because json_build_object takes "any": psycopg 3 sends strings untyped and
+# Postgres could not infer their type.
+NOTIFY = text(
+    f"SELECT pg_notify('{CHANNEL}', json_build_object("
+    "'seq', nextval('item_change_seq'), 'op', CAST(:op AS text), "
+    "'id', CAST(:id AS text), 'owner', CAST(:owner AS text))::text)"
+)
+
+
+def ensure_change_feed(engine: Engine) -> None:
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            conn.exec_driver_sql("CREATE SEQUENCE IF NOT EXISTS item_change_seq")
+
+
+class Subscription:
+    """Pending events of one client. Bounded: on overflow the client must resync."""
+
+    __slots__ = ("owner", "events", "ready", "overflowed", "maxlen")
+
+    def __init__(self, owner: str, maxlen: int) -> None:
+        self.owner = owner
+        self.events: deque[dict[str, Any]] = deque()
+        self.ready = asyncio.Event()
+        self.overflowed = False
+        self.maxlen = maxlen
+
+    def push(self, change: dict[str, Any]) -> None:
+        if len(self.events) >= self.maxlen:
+            self.events.clear()
+            self.overflowed = True
+        else:
+            self.events.append(change)
+        self.ready.set()
+
+
+class ChangeFeed:
+    """Fan out item changes to SSE subscribers, filtered by owner.
+
+    On Postgres, writes publish through NOTIFY inside their own transaction (so
+    only committed changes are sent) and one LISTEN connection per process,
+    driven by the event loop, receives them. Other databases (local dev) publish
+    in-process. The last ``buffer_size`` changes are kept for resuming clients.
+    """
+
+    def __init__(self, engine: Engine, *, buffer_size: int, queue_size: int) -> None:
+        self.engine = engine
+        self.queue_size = queue_size
+        self._recent: deque[dict[str, Any]] = deque(maxlen=buffer_size)
+        self._subscribers: dict[str, set[Subscription]] = defaultdict(set)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._conn = None
+        self._connecting: asyncio.Task | None = None
+        self._local_seq = itertools.count(1)
+        self._stopped = False
+
+    @property
+    def uses_notify(self) -> bool:
+        return self.engine.dialect.name == "postgresql"
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._stopped = False
+        if self.uses_notify:
+            self._connect()
+
+    async def stop(self) -> None:
+        self._stopped = True
+        self._disconnect()
+
+    def _connect(self) -> None:
+        if not self._stopped:
+            self._connecting = self._loop.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        # Connecting blocks (DNS, TCP, auth), so it runs off the event loop.
+        try:
+            conn = await self._loop.run_in_executor(None, self._open_listener)
+        except Exception:
+            logger.exception("Change feed listener could not connect, retrying")
+            self._loop.call_later(2, self._connect)
+            return
+        if self._stopped:
+            conn.close()
+            return
+        self._conn = conn
+        self._loop.add_reader(conn.fileno(), self._on_readable)
+
+    def _open_listener(self) -> Any:
+        # Always psycopg2, whose poll()/notifies suit add_reader, whatever DB_DRIVER is.
+        url = self.engine.url.set(drivername="postgresql+psycopg2")
+        dialect = url.get_dialect()
+        cargs, cparams = dialect().create_connect_args(url)
+        cparams.setdefault("connect_timeout", CHANGE_FEED_CONNECT_TIMEOUT_SECONDS)
+        conn = dialect.import_dbapi().connect(*cargs, **cparams)
+        try:
+            conn.autocommit = True
+            with conn.cursor() as cursor:
+                cursor.execute(f"LISTEN {CHANNEL}")
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def _disconnect(self) -> None:
+        if self._conn is None:
+            return
+        try:
+            self._loop.remove_reader(self._conn.fileno())
+            self._conn.close()
+        except Exception:
+            pass
+        self._conn = None
+
+    def _on_readable(self) -> None:
+        try:
+            self._conn.poll()
+        except Exception:
+            logger.exception("Change feed listener lost its connection, reconnecting")
+            self._disconnect()
+            # Changes may have been missed: every client resyncs.
+            self._reset_all()
+            self._loop.call_later(1, self._connect)
+            return
+        while self._conn.notifies:
+            self._dispatch(json.loads(self._conn.notifies.pop(0).payload))
+
+    def publish(self, conn: Connection, op: str, item_id: uuid.UUID, owner_id: uuid.UUID) -> None:
+        if conn.dialect.name == "postgresql":
+            conn.execute(NOTIFY, {"op": op, "id": str(item_id), "owner": str(owner_id)})
+        elif self._loop is not None:
+            change = {"seq": next(self._local_seq), "op": op, "id": str(item_id), "owner": str(owner_id)}
+            self._loop.call_soon_threadsafe(self._dispatch, change)
+
+    def _dispatch(self, change: dict[str, Any]) -> None:
+        self._recent.append(change)
+        for subscription in self._subscribers.get(change["owner"], ()):
+            subscription.push(change)
+
+    def _reset_all(self) -> None:
+        self._recent.clear()
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                subscription.events.clear()
+                subscription.overflowed = True
+                subscription.ready.set()
+
+    def subscribe(self, owner_id: uuid.UUID) -> Subscription:
+        subscription = Subscription(str(owner_id), self.queue_size)
+        self._subscribers[subscription.owner].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscriptions = self._subscribers.get(subscription.owner)
+        if subscriptions is not None:
+            subscriptions.discard(subscription)
+            if not subscriptions:
+                del self._subscribers[subscription.owner]
+
+    def replay(self, owner_id: uuid.UUID, since: int) -> list[dict[str, Any]] | None:
+        """Changes delivered after change ``since``, or None if it is no longer buffered.
+
+        Resumes from the position of ``since`` in delivery order, not from seq
+        values: a change with a lower seq can commit after one with a higher seq.
+        """
+        for position, change in enumerate(self._recent):
+            if change["seq"] == since:
+                owner = str(owner_id)
+                return [c for c in itertools.islice(self._recent, position + 1, None) if c["owner"] == owner]
+        return None
+
+
+change_feed = ChangeFeed(engine, buffer_size=CHANGE_FEED_BUFFER_SIZE, queue_size=CHANGE_FEED_QUEUE_SIZE)
+
+
+# Every ORM write to Item publishes a change in the same transaction.
+@event.listens_for(Item, "after_insert")
+def _item_created(mapper, connection, target) -> None:
+    change_feed.publish(connection, "created", target.id, target.owner_id)
+
+
+@event.listens_for(Item, "after_update")
+def _item_updated(mapper, connection, target) -> None:
+    change_feed.publish(connection, "updated", target.id, target.owner_id)
+
+
+@event.listens_for(Item, "after_delete")
+def _item_deleted(mapper, connection, target) -> None:
+    change_feed.publish(connection, "deleted", target.id, target.owner_id)
@@ -7,5 +7,9 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "change-me"  # must match AUTH service for JWT validation
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
     ENVIRONMENT: str = "local"
+    # "shared": items reads the auth-owned user table (same database, FK on owner_id).
+    # "replicated": items keeps its own principal table fed from the user outbox,
+    # so it can run on a separate database.
+    PRINCIPAL_SOURCE: str = "shared"
 
 settings = Settings()
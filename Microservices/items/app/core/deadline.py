@@ -0,0 +1,98 @@
+import os
+import time
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeoutError
+from sqlmodel import Session
+
+# Time budget of a request, counted from its arrival. Clients (or the gateway)
+# may ask for less with the header, never for more than the maximum.
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("REQUEST_TIMEOUT_SECONDS", "10"))
+REQUEST_TIMEOUT_MAX_SECONDS = float(os.getenv("REQUEST_TIMEOUT_MAX_SECONDS", "30"))
+TIMEOUT_HEADER = "X-Request-Timeout"  # seconds
+
+QUERY_CANCELED = "57014"  # Postgres SQLSTATE for statement_timeout / cancel
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class DeadlineMiddleware:
+    """Stamp each request with its arrival time, so time spent queued counts."""
+
+    def __init__(self, app: Any) -> None:
+        self.app = app
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] == "http":
+            scope.setdefault("state", {})["received_at"] = time.monotonic()
+        await self.app(scope, receive, send)
+
+
+def request_timeout(seconds: float) -> Callable:
+    """Per-route default budget; put it under the ``@router`` decorator."""
+    def decorate(endpoint: Callable) -> Callable:
+        endpoint.request_timeout = seconds
+        return endpoint
+    return decorate
+
+
+def request_deadline(request: Request) -> float:
+    route = request.scope.get("route")
+    budget = getattr(getattr(route, "endpoint", None), "request_timeout", REQUEST_TIMEOUT_SECONDS)
+    try:
+        budget = min(budget, float(request.headers.get(TIMEOUT_HEADER, "inf")))
+    except ValueError:
+        pass
+    budget = min(budget, REQUEST_TIMEOUT_MAX_SECONDS)
+    return getattr(request.state, "received_at", time.monotonic()) + budget
+
+
+def bind_deadline(session: Session, deadline: float) -> None:
+    session.info["deadline"] = deadline
+
+
+@event.listens_for(Session, "after_begin")
+def _apply_statement_timeout(session, transaction, connection) -> None:
+    # Each transaction gets what is left of the budget, so a request that has
+    # already waited long gets a shorter statement_timeout.
+    deadline = session.info.get("deadline")
+    if deadline is None:
+        return
+    remaining_ms = int((deadline - time.monotonic()) * 1000)
+    if remaining_ms <= 0:
+        raise DeadlineExceeded()
+    if connection.dialect.name == "postgresql":
+        connection.exec_driver_sql(f"SET LOCAL statement_timeout = {remaining_ms}")
+
+
+def deadline_exceeded_response() -> JSONResponse:
+    return JSONResponse(status_code=504, content={"detail": "Request deadline exceeded"})
+
+
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded) -> JSONResponse:
+    return deadline_exceeded_response()
+
+
+async def operational_error_handler(request: Request, exc: OperationalError) -> JSONResponse:
+    # psycopg 3 errors carry the SQLSTATE as .sqlstate, psycopg2 errors as .pgcode.
+    if (getattr(exc.orig, "sqlstate", None) or getattr(exc.orig, "pgcode", None)) == QUERY_CANCELED:
+        return deadline_exceeded_response()
+    return JSONResponse(status_code=503, content={"detail": "Database unavailable"}, headers={"Retry-After": "1"})
+
+
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError) -> JSONResponse:
+    # Every connection is busy: shed load rather than queue further.
+    return JSONResponse(status_code=503, content={"detail": "Database busy"}, headers={"Retry-After": "1"})
+
+
+EXCEPTION_HANDLERS = {
+    DeadlineExceeded: deadline_exceeded_handler,
+    OperationalError: operational_error_handler,
+    PoolTimeoutError: pool_timeout_handler,
+}
@@ -0,0 +1,146 @@
+import os
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any
+
+from sqlalchemy import Engine, insert
+
+from app.core.changes import change_feed
+from app.core.db import engine
+from app.core.deadline import DeadlineExceeded
+from app.models import Item, ItemPublic
+
+# Opt-in: concurrent create_item calls share one INSERT ... RETURNING transaction.
+GROUP_COMMIT_ENABLED = os.getenv("ITEMS_GROUP_COMMIT", "false").lower() in ("1", "true", "yes")
+GROUP_COMMIT_WINDOW_MS = float(os.getenv("ITEMS_GROUP_COMMIT_WINDOW_MS", "5"))
+GROUP_COMMIT_MAX_BATCH = int(os.getenv("ITEMS_GROUP_COMMIT_MAX_BATCH", "100"))
+
+RETURNING = (Item.id, Item.owner_id, Item.title, Item.description)
+
+Pending = tuple[dict[str, Any], float | None, Future]
+
+
+class GroupCommitter:
+    """Batch item inserts from concurrent requests into one transaction.
+
+    Request threads enqueue their row and block on a future. A single writer
+    thread takes the first queued row, waits up to ``window`` seconds (or until
+    ``max_batch`` rows) for more, then inserts them all with one multi-row
+    ``INSERT ... RETURNING`` and one commit. If the batch fails, rows are retried
+    one by one so a bad row only fails its own request.
+
+    Each row carries its request deadline: the request stops waiting once it
+    passes (504), a row still queued by then is dropped, and the batch runs
+    with a statement_timeout of what is left to its earliest deadline.
+    """
+
+    def __init__(self, engine: Engine, *, window: float, max_batch: int) -> None:
+        self.engine = engine
+        self.window = window
+        self.max_batch = max_batch
+        self._queue: queue.Queue[Pending | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    def submit(self, values: dict[str, Any], deadline: float | None = None) -> ItemPublic:
+        self._ensure_started()
+        future: Future = Future()
+        self._queue.put(({"id": uuid.uuid4(), **values}, deadline, future))
+        try:
+            return future.result(timeout=None if deadline is None else max(deadline - time.monotonic(), 0))
+        except FutureTimeoutError:
+            # Not inserted if still queued; if its batch is already running the
+            # row may commit anyway, as with any write that times out.
+            future.cancel()
+            raise DeadlineExceeded() from None
+
+    def stop(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="item-group-commit", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            stopping = False
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    pending = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if pending is None:
+                    stopping = True
+                    break
+                batch.append(pending)
+            self._flush(batch)
+            if stopping:
+                return
+
+    def _flush(self, batch: list[Pending]) -> None:
+        now = time.monotonic()
+        live = []
+        for pending in batch:
+            _, deadline, future = pending
+            if not future.set_running_or_notify_cancel():
+                continue  # its request gave up waiting
+            if deadline is not None and deadline <= now:
+                future.set_exception(DeadlineExceeded())
+            else:
+                live.append(pending)
+        if not live:
+            return
+        try:
+            results = self._insert([values for values, _, _ in live], [deadline for _, deadline, _ in live])
+        except Exception:
+            for values, deadline, future in live:
+                try:
+                    future.set_result(self._insert([values], [deadline])[values["id"]])
+                except Exception as exc:
+                    future.set_exception(exc)
+            return
+        for values, _, future in live:
+            future.set_result(results[values["id"]])
+
+    def _insert(self, rows: list[dict[str, Any]], deadlines: list[float | None]) -> dict[uuid.UUID, ItemPublic]:
+        deadline = min((d for d in deadlines if d is not None), default=None)
+        with self.engine.begin() as conn:
+            if deadline is not None:
+                remaining_ms = int((deadline - time.monotonic()) * 1000)
+                if remaining_ms <= 0:
+                    raise DeadlineExceeded()
+                if conn.dialect.name == "postgresql":
+                    conn.exec_driver_sql(f"SET LOCAL statement_timeout = {remaining_ms}")
+            returned = conn.execute(insert(Item).values(rows).returning(*RETURNING)).all()
+            # Core insert: no ORM events, publish the changes here
+            for r in returned:
+                change_feed.publish(conn, "created", r.id, r.owner_id)
+        return {
+            r.id: ItemPublic(id=r.id, owner_id=r.owner_id, title=r.title, description=r.description)
+            for r in returned
+        }
+
+
+group_committer = GroupCommitter(
+    engine, window=GROUP_COMMIT_WINDOW_MS / 1000, max_batch=GROUP_COMMIT_MAX_BATCH
+)
@@ -0,0 +1,104 @@
+import os
+import signal
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import Engine, text
+
+from app.core.db import engine
+
+HEALTH_PROBE_INTERVAL_SECONDS = float(os.getenv("HEALTH_PROBE_INTERVAL_SECONDS", "2"))
+# After SIGTERM the pod reports not ready but keeps serving this long, so the
+# gateway stops routing to it before uvicorn stops accepting connections.
+SHUTDOWN_DRAIN_SECONDS = float(os.getenv("SHUTDOWN_DRAIN_SECONDS", "5"))
+
+
+class HealthProber:
+    """Background DB/pool prober whose last result is served from memory.
+
+    Kubernetes probes only read the cached state, so probe traffic never reaches
+    Postgres. A result older than ``stale_after`` counts as not ready, which also
+    covers a probe stuck on an unreachable database.
+    """
+
+    def __init__(self, engine: Engine, interval: float) -> None:
+        self.engine = engine
+        self.interval = interval
+        self.stale_after = interval * 3
+        self._state: dict[str, Any] = {"database": "unknown", "checked_at": None}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="health-prober", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        # From here on readiness is false, so no new traffic is routed to a draining pod.
+        self._stop.set()
+        self._state = {**self._state, "database": "shutting down"}
+
+    def drain_on_sigterm(self, seconds: float) -> None:
+        """Wrap uvicorn's SIGTERM handler: fail readiness first, shut down ``seconds`` later.
+
+        Call from the event loop (main thread) once uvicorn has installed its handlers.
+        """
+        if threading.current_thread() is not threading.main_thread():
+            return
+        shutdown = signal.getsignal(signal.SIGTERM)
+        if not callable(shutdown):
+            return
+
+        def handle(sig: int, frame: Any) -> None:
+            if self._stop.is_set():  # second signal: no more waiting
+                shutdown(sig, frame)
+                return
+            self.stop()
+            threading.Timer(seconds, shutdown, args=(sig, None)).start()
+
+        signal.signal(signal.SIGTERM, handle)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.probe_once()
+            self._stop.wait(self.interval)
+
+    def probe_once(self) -> None:
+        started = time.monotonic()
+        try:
+            with self.engine.connect() as conn:
+                conn.execute(text("SELECT 1"))
+            database, error = "ok", None
+        except Exception as exc:
+            database, error = "unavailable", exc.__class__.__name__
+        if self._stop.is_set():
+            return
+        self._state = {
+            "database": database,
+            "error": error,
+            "latency_ms": round((time.monotonic() - started) * 1000, 1),
+            "pool": self.pool_state(),
+            "checked_at": time.monotonic(),
+        }
+
+    def pool_state(self) -> dict[str, int]:
+        pool = self.engine.pool
+        return {
+            name: getattr(pool, name)()
+            for name in ("size", "checkedin", "checkedout", "overflow")
+            if hasattr(pool, name)
+        }
+
+    def readiness(self) -> tuple[bool, dict[str, Any]]:
+        state = self._state
+        checked_at = state["checked_at"]
+        age = None if checked_at is None else time.monotonic() - checked_at
+        ready = state["database"] == "ok" and age is not None and age < self.stale_after
+        report = {k: v for k, v in state.items() if k != "checked_at"}
+        report["age_seconds"] = None if age is None else round(age, 1)
+        return ready, report
+
+
+prober = HealthProber(engine, HEALTH_PROBE_INTERVAL_SECONDS)
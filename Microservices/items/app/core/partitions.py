@@ -0,0 +1,87 @@
+import os
+
+from sqlalchemy import Engine, text
+
+from app.models import SHARED_USER_TABLE, Item
+
+# Hash-partition the item table by owner_id into this many partitions (Postgres
+# only, 0 = a single table). Only applies when the table is first created.
+ITEM_PARTITIONS = int(os.getenv("ITEM_PARTITIONS", "0"))
+
+# Every unique key of a partitioned table must contain the partition key, so the
+# primary key is (owner_id, id); it doubles as the owner index. ix_item_id keeps
+# lookups by id alone (superusers) to one index probe per partition.
+PARTITIONED_DDL = [
+    f"""CREATE TABLE item (
+        id UUID NOT NULL,
+        owner_id UUID NOT NULL{' REFERENCES "user" (id)' if SHARED_USER_TABLE else ''},
+        title VARCHAR(255) NOT NULL,
+        description VARCHAR(255),
+        PRIMARY KEY (owner_id, id)
+    ) PARTITION BY HASH (owner_id)""",
+    "CREATE INDEX ix_item_id ON item (id)",
+]
+
+PARTITION_DDL = "CREATE TABLE item_p{remainder} PARTITION OF item FOR VALUES WITH (MODULUS {modulus}, REMAINDER {remainder})"
+
+IS_PARTITIONED = text(
+    "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass('item'))"
+)
+
+
+def ensure_item_table(engine: Engine) -> None:
+    """Create the partitioned item table if configured, before create_all runs.
+
+    An existing table is never rewritten: moving rows into partitions is a
+    migration to run by hand (create the new table, copy, swap names).
+    """
+    if ITEM_PARTITIONS <= 0 or engine.dialect.name != "postgresql":
+        return
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT to_regclass('item') IS NOT NULL")).scalar():
+            if not conn.execute(IS_PARTITIONED).scalar():
+                raise RuntimeError(
+                    f"ITEM_PARTITIONS={ITEM_PARTITIONS} but the item table exists and is not partitioned; "
+                    "migrate it first or unset ITEM_PARTITIONS"
+                )
+            return
+        for statement in PARTITIONED_DDL:
+            conn.exec_driver_sql(statement)
+        for remainder in range(ITEM_PARTITIONS):
+            conn.exec_driver_sql(PARTITION_DDL.format(modulus=ITEM_PARTITIONS, remainder=remainder))
+
+
+INVALID_INDEXES = text(
+    "SELECT c.relname FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+    "WHERE i.indrelid = to_regclass('item') AND NOT i.indisvalid"
+)
+
+
+def create_item_indexes(engine: Engine, indexes: dict[str, str]) -> None:
+    """Create missing indexes on item, given as name -> "ON item ..." (Postgres).
+
+    Built CONCURRENTLY, so a large live table keeps taking writes meanwhile;
+    that needs autocommit. A build that failed half way leaves an invalid index
+    that IF NOT EXISTS would keep skipping, so it is dropped and rebuilt. A
+    partitioned table cannot be indexed concurrently; its indexes are built
+    with the (empty) table.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        concurrently = "" if conn.execute(IS_PARTITIONED).scalar() else "CONCURRENTLY "
+        invalid = set(conn.execute(INVALID_INDEXES).scalars())
+        for name, definition in indexes.items():
+            if name in invalid:
+                conn.exec_driver_sql(f"DROP INDEX {concurrently}{name}")
+            conn.exec_driver_sql(f"CREATE INDEX {concurrently}IF NOT EXISTS {name} {definition}")
+
+
+def ensure_owner_index(engine: Engine) -> None:
+    # create_all skips indexes of tables that already exist.
+    if engine.dialect.name != "postgresql":
+        for index in Item.__table__.indexes:
+            index.create(engine, checkfirst=True)
+    elif ITEM_PARTITIONS <= 0:  # else the (owner_id, id) primary key covers it
+        create_item_indexes(
+            engine,
+            {index.name: f"ON item ({', '.join(c.name for c in index.columns)})" for index in Item.__table__.indexes},
+        )
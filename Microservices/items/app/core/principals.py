@@ -0,0 +1,254 @@
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import (
+    Boolean, Column, Connection, Engine, Integer, MetaData, String, Table, Uuid,
+    create_engine, delete, func, insert, select, update,
+)
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+
+from app.core.db import DATABASE_URL, connect_args, engine, engine_url
+from app.models import SHARED_USER_TABLE, Item, Principal, PrincipalSyncState, UtcDateTime
+
+PRINCIPALS_REPLICATED = not SHARED_USER_TABLE
+# Database holding the user table and its outbox (auth/users).
+USERS_DATABASE_URL = os.getenv("USERS_DATABASE_URL", DATABASE_URL)
+PRINCIPAL_SYNC_INTERVAL_SECONDS = float(os.getenv("PRINCIPAL_SYNC_INTERVAL_SECONDS", "1"))
+PRINCIPAL_SYNC_BATCH_SIZE = int(os.getenv("PRINCIPAL_SYNC_BATCH_SIZE", "500"))
+# seq is assigned before commit, so a lower seq can commit after a higher one.
+# A gap is waited for this long before it is treated as a rolled-back write.
+PRINCIPAL_SYNC_GAP_GRACE_SECONDS = float(os.getenv("PRINCIPAL_SYNC_GAP_GRACE_SECONDS", "5"))
+ITEM_PURGE_CHUNK_SIZE = int(os.getenv("ITEM_PURGE_CHUNK_SIZE", "500"))
+# Delivered outbox rows are deleted this often (needs DELETE on user_outbox).
+USER_OUTBOX_PRUNE_INTERVAL_SECONDS = float(os.getenv("USER_OUTBOX_PRUNE_INTERVAL_SECONDS", "60"))
+
+CONSUMER = "user_outbox"
+
+# Source tables, owned by auth/users; only the columns read here.
+_source = MetaData()
+user_outbox = Table(
+    "user_outbox", _source,
+    Column("seq", Integer, primary_key=True),
+    Column("user_id", Uuid),
+    Column("op", String),
+    Column("email", String),
+    Column("full_name", String),
+    Column("is_active", Boolean),
+    Column("is_superuser", Boolean),
+    Column("created_at", UtcDateTime),
+)
+source_user = Table(
+    "user", _source,
+    Column("id", Uuid, primary_key=True),
+    Column("email", String),
+    Column("full_name", String),
+    Column("is_active", Boolean),
+    Column("is_superuser", Boolean),
+)
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class PrincipalSync:
+    """Keep the local principal table in step with the auth/users user outbox.
+
+    The consumer is idempotent: a change only applies when its seq is newer than
+    the one stored on the principal, and the offset is advanced in the same local
+    transaction, so replays and several pods consuming at once are harmless. The
+    first run backfills from the user table. Users deleted upstream become
+    inactive tombstones and their items are purged in small chunks. Applied
+    outbox rows are deleted every ``prune_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        source: Engine,
+        *,
+        interval: float,
+        batch_size: int,
+        gap_grace: float,
+        purge_chunk_size: int,
+        prune_interval: float,
+    ) -> None:
+        self.engine = engine
+        self.source = source
+        self.interval = interval
+        self.batch_size = batch_size
+        self.gap_grace = timedelta(seconds=gap_grace)
+        self.purge_chunk_size = purge_chunk_size
+        self.prune_interval = prune_interval
+        self._pruned_at = float("-inf")
+        self.status: dict[str, Any] = {"last_seq": None, "lag_events": None, "lag_seconds": None, "error": None}
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="principal-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self.source is not self.engine:
+            self.source.dispose()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                applied = self.sync_once()
+                if time.monotonic() - self._pruned_at >= self.prune_interval:
+                    self.prune_outbox()
+                self.status["error"] = None
+            except SQLAlchemyError as exc:
+                applied = 0
+                self.status["error"] = exc.__class__.__name__
+            # Keep going without pause while catching up.
+            if applied < self.batch_size:
+                self._stop.wait(self.interval)
+
+    def sync_once(self) -> int:
+        last_seq = self._last_seq()
+        if last_seq is None:
+            last_seq = self._backfill()
+        with self.source.connect() as src:
+            rows = src.execute(
+                select(user_outbox).where(user_outbox.c.seq > last_seq).order_by(user_outbox.c.seq).limit(self.batch_size)
+            ).all()
+            max_seq = src.execute(select(func.max(user_outbox.c.seq))).scalar() or 0
+
+        accepted = []
+        expected = last_seq + 1
+        for row in rows:
+            if row.seq != expected and utcnow() - row.created_at < self.gap_grace:
+                break  # wait for the missing seq to commit (or to age out)
+            accepted.append(row)
+            expected = row.seq + 1
+
+        deleted: list[uuid.UUID] = []
+        if accepted:
+            try:
+                with self.engine.begin() as conn:
+                    for row in accepted:
+                        self._apply(conn, row)
+                        if row.op == "delete":
+                            deleted.append(row.user_id)
+                    conn.execute(
+                        update(PrincipalSyncState)
+                        .where(PrincipalSyncState.consumer == CONSUMER, PrincipalSyncState.last_seq < accepted[-1].seq)
+                        .values(last_seq=accepted[-1].seq, last_event_at=accepted[-1].created_at)
+                    )
+            except IntegrityError:
+                return 0  # another pod inserted the same principal first; retry next round
+            last_seq = accepted[-1].seq
+            for user_id in deleted:
+                self._purge_items(user_id)
+
+        pending = rows[len(accepted)] if len(rows) > len(accepted) else None
+        self.status.update(
+            last_seq=last_seq,
+            lag_events=max(0, max_seq - last_seq),
+            lag_seconds=round((utcnow() - pending.created_at).total_seconds(), 1) if pending else 0.0,
+        )
+        return len(accepted)
+
+
+    def _last_seq(self) -> int | None:
+        with self.engine.connect() as conn:
+            return conn.execute(
+                select(PrincipalSyncState.last_seq).where(PrincipalSyncState.consumer == CONSUMER)
+            ).scalar()
+
+    def _apply(self, conn: Connection, row: Any) -> None:
+        if row.op == "delete":
+            values = {"email": None, "full_name": None, "is_active": False, "is_superuser": False}
+        else:
+            values = {
+                "email": row.email,
+                "full_name": row.full_name,
+                "is_active": row.is_active,
+                "is_superuser": row.is_superuser,
+            }
+        self._upsert(conn, row.user_id, row.seq, values)
+
+    def _upsert(self, conn: Connection, user_id: uuid.UUID, seq: int, values: dict[str, Any]) -> None:
+        current = conn.execute(select(Principal.source_seq).where(Principal.id == user_id)).scalar()
+        if current is None:
+            conn.execute(insert(Principal).values(id=user_id, source_seq=seq, **values))
+        elif current < seq:
+            conn.execute(update(Principal).where(Principal.id == user_id).values(source_seq=seq, **values))
+
+    def _backfill(self) -> int:
+        # Snapshot the user table as of the current outbox position; later outbox
+        # rows have a higher seq and win over the snapshot.
+        with self.source.connect() as src:
+            snapshot_seq = src.execute(select(func.max(user_outbox.c.seq))).scalar() or 0
+        after: uuid.UUID | None = None
+        while True:
+            query = select(source_user).order_by(source_user.c.id).limit(self.batch_size)
+            if after is not None:
+                query = query.where(source_user.c.id > after)
+            with self.source.connect() as src:
+                users = src.execute(query).all()
+            if not users:
+                break
+            with self.engine.begin() as conn:
+                for u in users:
+                    self._upsert(conn, u.id, snapshot_seq, {
+                        "email": u.email, "full_name": u.full_name,
+                        "is_active": u.is_active, "is_superuser": u.is_superuser,
+                    })
+            after = users[-1].id
+        try:
+            with self.engine.begin() as conn:
+                conn.execute(insert(PrincipalSyncState).values(consumer=CONSUMER, last_seq=snapshot_seq))
+        except IntegrityError:
+            pass  # another pod finished its backfill first
+        return snapshot_seq
+
+    def prune_outbox(self) -> None:
+        last_seq = self._last_seq()
+        if last_seq is None:
+            return
+        # Rows below the offset are applied. The row at the offset is kept so
+        # SQLite (max rowid + 1) never hands out an applied seq again.
+        chunk = select(user_outbox.c.seq).where(user_outbox.c.seq < last_seq).limit(self.purge_chunk_size)
+        while not self._stop.is_set():
+            with self.source.begin() as src:
+                if src.execute(delete(user_outbox).where(user_outbox.c.seq.in_(chunk))).rowcount < self.purge_chunk_size:
+                    break
+            time.sleep(0.05)
+        self._pruned_at = time.monotonic()
+
+    def _purge_items(self, owner_id: uuid.UUID) -> None:
+        chunk = select(Item.id).where(Item.owner_id == owner_id).limit(self.purge_chunk_size)
+        while not self._stop.is_set():
+            with self.engine.begin() as conn:
+                if conn.execute(delete(Item).where(Item.owner_id == owner_id, Item.id.in_(chunk))).rowcount < self.purge_chunk_size:
+                    return
+            time.sleep(0.05)
+
+
+principal_sync = PrincipalSync(
+    engine,
+    engine if USERS_DATABASE_URL == DATABASE_URL else create_engine(
+        engine_url(USERS_DATABASE_URL),
+        pool_size=1,
+        max_overflow=1,
+        connect_args=connect_args(engine_url(USERS_DATABASE_URL)),
+    ),
+    interval=PRINCIPAL_SYNC_INTERVAL_SECONDS,
+    batch_size=PRINCIPAL_SYNC_BATCH_SIZE,
+    gap_grace=PRINCIPAL_SYNC_GAP_GRACE_SECONDS,
+    purge_chunk_size=ITEM_PURGE_CHUNK_SIZE,
+    prune_interval=USER_OUTBOX_PRUNE_INTERVAL_SECONDS,
+)
@@ -1,7 +1,13 @@
 import uuid
+from datetime import datetime, timezone
 from pydantic import EmailStr
+from sqlalchemy import DateTime, Index, TypeDecorator
 from sqlmodel import Field, SQLModel
 
+from app.core.config import settings
+
+SHARED_USER_TABLE = settings.PRINCIPAL_SOURCE == "shared"
+
 # Minimal mapping for the shared 'user' table so we can FK to it.
 class User(SQLModel, table=True):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
@@ -23,11 +29,41 @@ class ItemUpdate(ItemBase):
     title: str | None = Field(default=None, min_length=1, max_length=255)
 
 class Item(SQLModel, table=True):
+    # Every user-facing query filters on owner_id; id makes the index cover keyset order.
+    __table_args__ = (Index("ix_item_owner_id_id", "owner_id", "id"),)
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
-    owner_id: uuid.UUID = Field(foreign_key="user.id", nullable=False)
+    owner_id: uuid.UUID = Field(foreign_key="user.id" if SHARED_USER_TABLE else None, nullable=False)
     title: str = Field(min_length=1, max_length=255)
     description: str | None = Field(default=None, max_length=255)
 
+# Local copy of the users items needs (PRINCIPAL_SOURCE=replicated), kept up to
+# date from the auth/users outbox by app/core/principals.py. Deleted users stay
+# as inactive tombstones.
+class Principal(SQLModel, table=True):
+    id: uuid.UUID = Field(primary_key=True)
+    email: str | None = Field(default=None, max_length=255)
+    full_name: str | None = Field(default=None, max_length=255)
+    is_active: bool = True
+    is_superuser: bool = False
+    source_seq: int = 0  # outbox seq of the last applied change
+
+# TIMESTAMPTZ on Postgres. SQLite (local dev) has no time zone type and gives
+# back the naive UTC value it was given, which is made aware again here.
+class UtcDateTime(TypeDecorator):
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def process_result_value(self, value: datetime | None, dialect) -> datetime | None:
+        if value is not None and value.tzinfo is None:
+            return value.replace(tzinfo=timezone.utc)
+        return value
+
+class PrincipalSyncState(SQLModel, table=True):
+    __tablename__ = "principal_sync_state"
+    consumer: str = Field(primary_key=True, max_length=64)
+    last_seq: int = 0
+    last_event_at: datetime | None = Field(default=None, sa_type=UtcDateTime)
+
 class ItemPublic(ItemBase):
     id: uuid.UUID
     owner_id: uuid.UUID
@@ -36,6 +72,10 @@ class ItemsPublic(SQLModel):
     data: list[ItemPublic]
     count: int
 
+class ItemSearchResults(SQLModel):
+    data: list[ItemPublic]
+    next_cursor: str | None = None
+
 class Message(SQLModel):
     message: str
 
@@ -0,0 +1,134 @@
+import base64
+import json
+import re
+import uuid
+
+from sqlalchemy import Engine, Float, Uuid, bindparam, text
+from sqlmodel import Session
+
+from app.core.partitions import create_item_indexes
+from app.models import ItemPublic
+
+# Postgres: the GIN index is on this exact expression, queries must repeat it verbatim.
+PG_DOCUMENT = "to_tsvector('simple', coalesce(title, '') || ' ' || coalesce(description, ''))"
+
+# Needs the pg_trgm extension, installed once by a database owner beforehand
+# (CREATE EXTENSION pg_trgm); the service role is not expected to have that right.
+PG_INDEXES = {
+    "ix_item_search_document": f"ON item USING gin ({PG_DOCUMENT})",
+    "ix_item_title_trgm": "ON item USING gin (title gin_trgm_ops)",
+}
+
+# SQLite: external-content FTS5 table kept in sync with item by triggers.
+SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE item_fts USING fts5(title, description, content='item', content_rowid='rowid')",
+    """CREATE TRIGGER item_fts_ai AFTER INSERT ON item BEGIN
+        INSERT INTO item_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+    END""",
+    """CREATE TRIGGER item_fts_ad AFTER DELETE ON item BEGIN
+        INSERT INTO item_fts(item_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description);
+    END""",
+    """CREATE TRIGGER item_fts_au AFTER UPDATE ON item BEGIN
+        INSERT INTO item_fts(item_fts, rowid, title, description) VALUES ('delete', old.rowid, old.title, old.description);
+        INSERT INTO item_fts(rowid, title, description) VALUES (new.rowid, new.title, new.description);
+    END""",
+    "INSERT INTO item_fts(item_fts) VALUES ('rebuild')",
+]
+
+# Ranked results, keyset paginated on (score DESC, id ASC). The score is a
+# float8 so the cursor's Python float compares equal to it again: a float4 rank
+# widened to float8 on the way back would not, and ties would break across pages.
+KEYSET = "(:after_score IS NULL OR score < :after_score OR (score = :after_score AND id > :after_id))"
+
+PG_SEARCH = f"""
+SELECT id, owner_id, title, description, score FROM (
+    SELECT id, owner_id, title, description,
+           (ts_rank_cd({PG_DOCUMENT}, to_tsquery('simple', :tsquery)) + similarity(title, :q))::float8 AS score
+    FROM item
+    WHERE owner_id = :owner_id
+      AND ({PG_DOCUMENT} @@ to_tsquery('simple', :tsquery) OR title % :q)
+) AS hits
+WHERE {KEYSET}
+ORDER BY score DESC, id
+LIMIT :limit
+"""
+
+SQLITE_SEARCH = f"""
+SELECT id, owner_id, title, description, score FROM (
+    SELECT item.id AS id, item.owner_id AS owner_id, item.title AS title,
+           item.description AS description, -bm25(item_fts) AS score
+    FROM item_fts JOIN item ON item.rowid = item_fts.rowid
+    WHERE item_fts MATCH :match AND item.owner_id = :owner_id
+) AS hits
+WHERE {KEYSET}
+ORDER BY score DESC, id
+LIMIT :limit
+"""
+
+MAX_TERMS = 8
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def ensure_search_indexes(engine: Engine) -> None:
+    if engine.dialect.name == "postgresql":
+        with engine.connect() as conn:
+            installed = conn.exec_driver_sql("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'").first()
+        if not installed:
+            raise RuntimeError("Search needs the pg_trgm extension: run CREATE EXTENSION pg_trgm as a database owner")
+        create_item_indexes(engine, PG_INDEXES)
+    elif engine.dialect.name == "sqlite":
+        with engine.begin() as conn:
+            exists = conn.exec_driver_sql(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'item_fts'"
+            ).first()
+            if not exists:
+                for statement in SQLITE_DDL:
+                    conn.exec_driver_sql(statement)
+
+
+def encode_cursor(score: float, item_id: uuid.UUID) -> str:
+    raw = json.dumps([score, str(item_id)]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[float, uuid.UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, item_id = json.loads(raw)
+        return float(score), uuid.UUID(item_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+def search_items(
+    *, session: Session, owner_id: uuid.UUID, q: str, limit: int, cursor: str | None = None
+) -> tuple[list[ItemPublic], str | None]:
+    terms = re.findall(r"\w+", q.lower())[:MAX_TERMS]
+    if not terms:
+        return [], None
+    after_score, after_id = decode_cursor(cursor) if cursor else (None, None)
+
+    params = {"owner_id": owner_id, "after_score": after_score, "after_id": after_id, "limit": limit + 1}
+    if session.get_bind().dialect.name == "sqlite":
+        statement = text(SQLITE_SEARCH)
+        params["match"] = " ".join(f'"{t}"*' for t in terms)
+    else:
+        statement = text(PG_SEARCH)
+        params["tsquery"] = " & ".join(f"{t}:*" for t in terms)
+        params["q"] = " ".join(terms)
+    statement = statement.bindparams(
+        bindparam("owner_id", type_=Uuid),
+        bindparam("after_id", type_=Uuid),
+        bindparam("after_score", type_=Float),
+    ).columns(id=Uuid, owner_id=Uuid, score=Float)
+
+    rows = session.connection().execute(statement, params).all()
+    next_cursor = encode_cursor(rows[limit - 1].score, rows[limit - 1].id) if len(rows) > limit else None
+    data = [
+        ItemPublic(id=r.id, owner_id=r.owner_id, title=r.title, description=r.description)
+        for r in rows[:limit]
+    ]
+    return data, next_cursor
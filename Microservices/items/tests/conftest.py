@@ -0,0 +1,55 @@
+"""Run from the service directory: ``python -m pytest tests``.
+
+Tests use a scratch SQLite database, or TEST_DATABASE_URL (an empty Postgres
+database) for the Postgres-only cases. Settings are read at import time, so the
+environment is set here before anything imports ``app``.
+"""
+import os
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/items.db"
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import jwt  # noqa: E402
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlmodel import Session  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.db import engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import SHARED_USER_TABLE, Principal, User  # noqa: E402
+
+engine.echo = False
+
+requires_postgres = pytest.mark.skipif(
+    engine.dialect.name != "postgresql", reason="needs TEST_DATABASE_URL=postgresql://..."
+)
+
+
+def token(user_id: uuid.UUID) -> str:
+    expire = datetime.now(timezone.utc) + timedelta(hours=1)
+    return jwt.encode({"sub": str(user_id), "exp": expire}, settings.SECRET_KEY, algorithm="HS256")
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def owner(client) -> dict[str, str]:
+    """Auth headers of a fresh user with no items."""
+    user_id = uuid.uuid4()
+    with Session(engine) as session:
+        if SHARED_USER_TABLE:
+            session.add(User(id=user_id, email=f"{user_id.hex}@example.com", hashed_password="x"))
+        else:
+            session.add(Principal(id=user_id, email=f"{user_id.hex}@example.com"))
+        session.commit()
+    return {"Authorization": f"Bearer {token(user_id)}"}
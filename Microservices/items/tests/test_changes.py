@@ -0,0 +1,89 @@
+import asyncio
+import importlib.util
+import json
+import socket
+import time
+import uuid
+
+import pytest
+from sqlalchemy import create_engine
+
+from app.core.changes import CHANNEL, ChangeFeed, ensure_change_feed
+from app.core.db import engine
+from conftest import requires_postgres
+
+OWNER = uuid.uuid4()
+
+
+def feed_with(*seqs: int) -> ChangeFeed:
+    feed = ChangeFeed(engine, buffer_size=10, queue_size=10)
+    for seq in seqs:
+        feed._dispatch({"seq": seq, "op": "created", "id": str(uuid.uuid4()), "owner": str(OWNER)})
+    return feed
+
+
+def test_replay_follows_commit_order_not_seq_order():
+    # seq 2 was drawn before 3 but committed after it.
+    feed = feed_with(1, 3, 2, 4)
+
+    assert [c["seq"] for c in feed.replay(OWNER, since=3)] == [2, 4]
+    assert [c["seq"] for c in feed.replay(OWNER, since=4)] == []
+
+
+def test_replay_resets_when_the_last_seen_change_is_not_buffered():
+    feed = feed_with(*range(1, 15))  # 1..4 evicted
+
+    assert feed.replay(OWNER, since=2) is None
+    assert feed.replay(OWNER, since=99) is None
+    assert [c["seq"] for c in feed.replay(OWNER, since=12)] == [13, 14]
+
+
+class SlowListener:
+    def __init__(self) -> None:
+        time.sleep(0.3)  # a slow or unreachable database
+        self.sock, self.peer = socket.socketpair()
+        self.notifies: list = []
+
+    def fileno(self) -> int:
+        return self.sock.fileno()
+
+    def close(self) -> None:
+        self.sock.close()
+        self.peer.close()
+
+
+def test_listener_connects_off_the_event_loop(monkeypatch):
+    monkeypatch.setattr(ChangeFeed, "uses_notify", True)
+    monkeypatch.setattr(ChangeFeed, "_open_listener", lambda self: SlowListener())
+    feed = ChangeFeed(engine, buffer_size=10, queue_size=10)
+
+    async def run() -> None:
+        started = time.monotonic()
+        await feed.start()
+        await asyncio.sleep(0)
+        assert time.monotonic() - started < 0.1
+        assert feed._conn is None
+        await feed._connecting
+        assert isinstance(feed._conn, SlowListener)
+        await feed.stop()
+
+    asyncio.run(run())
+
+
+@requires_postgres
+@pytest.mark.skipif(not importlib.util.find_spec("psycopg"), reason="needs psycopg 3")
+def test_notify_runs_under_psycopg3():
+    # psycopg 3 sends string binds untyped; json_build_object cannot infer them.
+    psycopg_engine = create_engine(engine.url.set(drivername="postgresql+psycopg"))
+    ensure_change_feed(psycopg_engine)
+    item_id = uuid.uuid4()
+    with psycopg_engine.connect() as conn:
+        conn.exec_driver_sql(f"LISTEN {CHANNEL}")
+        conn.commit()
+        ChangeFeed(psycopg_engine, buffer_size=10, queue_size=10).publish(conn, "created", item_id, OWNER)
+        conn.commit()
+        notify = next(conn.connection.driver_connection.notifies(timeout=5, stop_after=1))
+    psycopg_engine.dispose()
+
+    change = json.loads(notify.payload)
+    assert (change["op"], change["id"], change["owner"]) == ("created", str(item_id), str(OWNER))
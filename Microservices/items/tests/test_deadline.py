@@ -0,0 +1,31 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+from app.core.deadline import EXCEPTION_HANDLERS, QUERY_CANCELED
+
+
+class Psycopg2Error(Exception):
+    pgcode = QUERY_CANCELED
+
+
+class Psycopg3Error(Exception):
+    sqlstate = QUERY_CANCELED
+
+
+class ConnectionLost(Exception):
+    pgcode = None
+
+
+@pytest.mark.parametrize(
+    ("orig", "status"), [(Psycopg2Error(), 504), (Psycopg3Error(), 504), (ConnectionLost(), 503)]
+)
+def test_operational_errors_map_to_gateway_statuses(orig, status):
+    app = FastAPI(exception_handlers=EXCEPTION_HANDLERS)
+
+    @app.get("/query")
+    def query():
+        raise OperationalError("SELECT 1", {}, orig)
+
+    assert TestClient(app).get("/query").status_code == status
@@ -0,0 +1,35 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app.api.routes import items as item_routes
+from app.core.db import engine
+from app.core.group_commit import GroupCommitter
+
+
+def test_group_commit_with_more_concurrent_creates_than_pooled_connections(client, owner, monkeypatch):
+    monkeypatch.setattr(item_routes, "GROUP_COMMIT_ENABLED", True)
+    requests = 2 * (engine.pool.size() + engine.pool._max_overflow) + 5
+
+    def create(n: int) -> int:
+        return client.post("/items/", json={"title": f"grouped {n}"}, headers=owner).status_code
+
+    with ThreadPoolExecutor(max_workers=requests) as pool:
+        statuses = list(pool.map(create, range(requests)))
+
+    assert statuses == [200] * requests
+    listed = client.get("/items/", params={"limit": requests}, headers=owner).json()
+    assert listed["count"] == requests
+
+
+def test_group_commit_gives_up_at_the_request_deadline(client, owner, monkeypatch):
+    committer = GroupCommitter(engine, window=0.5, max_batch=100)
+    monkeypatch.setattr(item_routes, "GROUP_COMMIT_ENABLED", True)
+    monkeypatch.setattr(item_routes, "group_committer", committer)
+
+    started = time.monotonic()
+    response = client.post("/items/", json={"title": "too late"}, headers={**owner, "X-Request-Timeout": "0.1"})
+    committer.stop()  # flushes the batch the request gave up on
+
+    assert response.status_code == 504
+    assert time.monotonic() - started < 0.5
+    assert client.get("/items/", headers=owner).json()["count"] == 0
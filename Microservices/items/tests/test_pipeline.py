@@ -0,0 +1,36 @@
+import importlib.util
+import os
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, literal, select
+from sqlmodel import Session
+
+from app.core.db import engine, engine_url
+from app.core.deadline import EXCEPTION_HANDLERS
+from app.core.pipeline import execute_pipelined
+from conftest import requires_postgres
+
+
+def test_statements_run_one_after_the_other_without_psycopg():
+    with Session(engine) as session:
+        assert execute_pipelined(session, select(literal(1)), select(literal(2), literal(3))) == [[(1,)], [(2, 3)]]
+
+
+@requires_postgres
+@pytest.mark.skipif(not importlib.util.find_spec("psycopg"), reason="needs psycopg 3")
+def test_pipelined_statement_timeout_maps_to_504():
+    psycopg_engine = create_engine(engine_url(os.environ["TEST_DATABASE_URL"], "psycopg"))
+    app = FastAPI(exception_handlers=EXCEPTION_HANDLERS)
+
+    @app.get("/slow")
+    def slow():
+        with Session(psycopg_engine) as session:
+            session.connection().exec_driver_sql("SET LOCAL statement_timeout = 50")
+            execute_pipelined(session, select(func.pg_sleep(1)), select(literal(1)))
+
+    try:
+        assert TestClient(app).get("/slow").status_code == 504
+    finally:
+        psycopg_engine.dispose()
@@ -0,0 +1,61 @@
+import json
+import os
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.models import SHARED_USER_TABLE, User
+from conftest import token
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+
+# PRINCIPAL_SOURCE is read at import time, so replicated mode runs in its own process.
+PROBE = """
+import json, sys, uuid
+sys.path.insert(0, "tests")
+from fastapi.testclient import TestClient
+from conftest import token
+from app.core.principals import _source, principal_sync
+from app.main import app
+
+_source.create_all(principal_sync.source)
+headers = {"Authorization": f"Bearer {token(uuid.uuid4())}"}
+with TestClient(app) as client:
+    created = client.post("/items/", json={"title": "before replication"}, headers=headers)
+    listed = client.get("/items/", params={"expand": "owner"}, headers=headers)
+print(json.dumps({"created": created.status_code, "listed": listed.json()}))
+"""
+
+
+def test_unreplicated_principal_can_write_and_lists_with_a_null_owner(tmp_path):
+    env = {
+        **os.environ, "PRINCIPAL_SOURCE": "replicated", "TEST_DATABASE_URL": "",
+        "USERS_DATABASE_URL": f"sqlite:///{tmp_path}/users.db", "PRINCIPAL_SYNC_INTERVAL_SECONDS": "60",
+    }
+    run = subprocess.run(
+        [sys.executable, "-c", PROBE], cwd=SERVICE_DIR, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert run.returncode == 0, run.stderr
+    result = json.loads(run.stdout.strip().splitlines()[-1])
+
+    assert result["created"] == 200
+    assert result["listed"]["count"] == 1
+    assert result["listed"]["data"][0]["owner"] is None
+
+
+@pytest.mark.skipif(not SHARED_USER_TABLE, reason="shared user table only")
+def test_inactive_shared_user_cannot_create_items(client):
+    user_id = uuid.uuid4()
+    with Session(engine) as session:
+        # Deactivated by DELETE /users/{id} while the deletion job runs.
+        session.add(User(id=user_id, email=f"{user_id.hex}@example.com", hashed_password="x", is_active=False))
+        session.commit()
+
+    response = client.post("/items/", json={"title": "x"}, headers={"Authorization": f"Bearer {token(user_id)}"})
+
+    assert response.status_code == 403
@@ -0,0 +1,43 @@
+import time
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+from app.core.replicas import READ_PRIMARY_HEADER, ReadYourWritesMiddleware, ReplicaRouter, read_primary_until
+
+
+def make_app() -> tuple[FastAPI, ReplicaRouter]:
+    primary, replica = create_engine("sqlite://"), create_engine("sqlite://")
+    router = ReplicaRouter(primary, [replica], check_interval=3600, sticky_seconds=5)
+    router._health[0] = (time.monotonic(), True)
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, router=router)
+
+    @app.post("/write")
+    def write():
+        return {}
+
+    @app.get("/read")
+    def read(request: Request):
+        return {"primary": router.engine_for_read(None, read_primary_until(request)) is primary}
+
+    return app, router
+
+
+def test_write_marker_sends_the_next_read_to_the_primary():
+    app, _ = make_app()
+    # A fresh client per request, as if each landed on another worker or pod.
+    assert TestClient(app).get("/read").json() == {"primary": False}
+    response = TestClient(app).post("/write")
+    marker = response.headers[READ_PRIMARY_HEADER]
+
+    assert TestClient(app).get("/read", headers={READ_PRIMARY_HEADER: marker}).json() == {"primary": True}
+    assert TestClient(app).get("/read", cookies=dict(response.cookies)).json() == {"primary": True}
+
+
+def test_expired_or_implausible_markers_are_ignored():
+    app, _ = make_app()
+    client = TestClient(app)
+    for marker in (time.time() - 1, time.time() + 3600, "junk"):
+        assert client.get("/read", headers={READ_PRIMARY_HEADER: str(marker)}).json() == {"primary": False}
@@ -0,0 +1,83 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from sqlalchemy import create_engine, select
+
+from app.core.schema import SCHEMA_VERSION, SERVICE, schema_version
+from conftest import requires_postgres
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def recorded_version(url: str) -> int | None:
+    engine = create_engine(url)
+    try:
+        with engine.connect() as conn:
+            return conn.execute(select(schema_version.c.version).where(schema_version.c.service == SERVICE)).scalar()
+    finally:
+        engine.dispose()
+
+
+def test_server_starts_two_workers_on_a_fresh_database(tmp_path):
+    url = os.getenv("TEST_DATABASE_URL") or f"sqlite:///{tmp_path}/fresh.db"
+    log = tmp_path / "server.log"
+    env = {
+        **os.environ, "DATABASE_URL": url, "DB_SCHEMA_MODE": "create",
+        "WEB_CONCURRENCY": "2", "HOST": "127.0.0.1", "PORT": str(free_port()), "SHUTDOWN_DRAIN_SECONDS": "0",
+    }
+    with log.open("w") as out:
+        server = subprocess.Popen([sys.executable, "-m", "app.server"], cwd=SERVICE_DIR, env=env, stdout=out, stderr=out)
+    try:
+        deadline = time.monotonic() + 60
+        while log.read_text().count("Application startup complete") < 2:
+            assert server.poll() is None, log.read_text()
+            assert time.monotonic() < deadline, log.read_text()
+            time.sleep(0.2)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+
+    assert "Traceback" not in log.read_text()
+    assert recorded_version(url) == SCHEMA_VERSION
+
+
+@requires_postgres
+def test_concurrent_schema_creation():
+    # Two pods starting at once, each in create mode.
+    env = {**os.environ, "DATABASE_URL": os.environ["TEST_DATABASE_URL"], "DB_SCHEMA_MODE": "create"}
+    probe = "import app.main; from app.core.db import engine; from app.core.schema import prepare_database; prepare_database(engine)"
+    runs = [
+        subprocess.Popen([sys.executable, "-c", probe], cwd=SERVICE_DIR, env=env, stderr=subprocess.PIPE, text=True)
+        for _ in range(4)
+    ]
+    for run in runs:
+        _, err = run.communicate(timeout=120)
+        assert run.returncode == 0, err
+    assert recorded_version(os.environ["TEST_DATABASE_URL"]) == SCHEMA_VERSION
+
+
+@requires_postgres
+def test_owner_index_is_rebuilt_concurrently_on_an_existing_table():
+    from app.core.db import engine
+    from app.core.partitions import ITEM_PARTITIONS, ensure_owner_index
+
+    if ITEM_PARTITIONS:
+        return
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX IF EXISTS ix_item_owner_id_id")
+    ensure_owner_index(engine)
+    with engine.connect() as conn:
+        valid = conn.exec_driver_sql(
+            "SELECT i.indisvalid FROM pg_index i WHERE i.indexrelid = to_regclass('ix_item_owner_id_id')"
+        ).scalar()
+    assert valid is True
@@ -0,0 +1,24 @@
+def search_all(client, headers, q: str, limit: int) -> list[str]:
+    ids, cursor = [], None
+    while True:
+        params = {"q": q, "limit": limit, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/items/search", params=params, headers=headers)
+        assert response.status_code == 200, response.text
+        ids += [item["id"] for item in response.json()["data"]]
+        cursor = response.json()["next_cursor"]
+        if cursor is None:
+            return ids
+
+
+def test_search_pages_through_tied_scores(client, owner):
+    # Identical documents rank the same: every page boundary falls inside a tie.
+    created = {
+        client.post("/items/", json={"title": "apple pie", "description": "tasty dessert"}, headers=owner).json()["id"]
+        for _ in range(7)
+    }
+    created.add(client.post("/items/", json={"title": "apple"}, headers=owner).json()["id"])
+
+    ids = search_all(client, owner, "apple", limit=2)
+
+    assert len(ids) == len(set(ids))
+    assert set(ids) == created
@@ -0,0 +1,32 @@
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import Select, select
+
+# Sparse fieldsets: ?fields=id,title selects only those columns and serializes the
+# row tuples directly, without building ORM instances or response models.
+
+def parse_fields(fields: str | None, allowed: Iterable[str]) -> list[str] | None:
+    if not fields:
+        return None
+    allowed = set(allowed)
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in allowed]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    # id is always returned so clients can key the results
+    return list(dict.fromkeys(["id", *requested]))
+
+def select_columns(model: Any, names: Sequence[str]) -> Select:
+    # Plain SQLAlchemy select: results are always row tuples, even for one column
+    # (sqlmodel's select would return bare scalars).
+    return select(*(getattr(model, name) for name in names))
+
+def row_dict(names: Sequence[str], row: Sequence[Any]) -> dict[str, Any]:
+    return dict(zip(names, row))
+
+def sparse_response(content: Any) -> JSONResponse:
+    return JSONResponse(jsonable_encoder(content))
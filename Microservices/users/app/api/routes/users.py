@@ -5,18 +5,33 @@ from fastapi import APIRouter, HTTPException
 from sqlmodel import select, func
 
 from app.api.deps import SessionDep, CurrentUser, get_current_active_superuser
-from app.models import User, UserPublic, UsersPublic, UserUpdate, Message
+from app.api.fields import parse_fields, row_dict, select_columns, sparse_response
+from app.core.deadline import request_timeout
+from app.core.deletion import deletion_worker
+from app.core.outbox import record_user_change
+from app.core.pipeline import execute_pipelined
+from app.models import User, UserDeletion, UserDeletionPublic, UserPublic, UsersPublic, UserUpdate, Message
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 @router.get("/", response_model=UsersPublic)
-def read_users(session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100) -> Any:
+@request_timeout(5)
+def read_users(
+    session: SessionDep, current_user: CurrentUser, skip: int = 0, limit: int = 100, fields: str | None = None
+) -> Any:
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough privileges")
-    users = session.exec(select(User).offset(skip).limit(limit)).all()
-    count = session.exec(select(func.count()).select_from(User)).one()
-    data = [UserPublic.model_validate(u) for u in users]
-    return UsersPublic(data=data, count=count)
+    selected = parse_fields(fields, UserPublic.model_fields)
+    names = selected or list(UserPublic.model_fields)
+    counts, rows = execute_pipelined(
+        session,
+        select(func.count()).select_from(User),
+        select_columns(User, names).offset(skip).limit(limit),
+    )
+    data = [row_dict(names, r) for r in rows]
+    if selected:
+        return sparse_response({"data": data, "count": counts[0][0]})
+    return UsersPublic(data=[UserPublic(**user) for user in data], count=counts[0][0])
 
 @router.get("/me", response_model=UserPublic)
 def read_user_me(current_user: CurrentUser) -> Any:
@@ -30,12 +45,46 @@ def update_user_me(session: SessionDep, current_user: CurrentUser, user_in: User
     if user_in.full_name is not None:
         current_user.full_name = user_in.full_name
     session.add(current_user)
+    record_user_change(session, current_user)
     session.commit()
     session.refresh(current_user)
     return UserPublic.model_validate(current_user)
 
+BATCH_MAX_IDS = 200
+
+# Declared before /{user_id} so "batch" is not parsed as a user id.
+@router.get("/batch", response_model=UsersPublic)
+def read_users_batch(session: SessionDep, current_user: CurrentUser, ids: str, fields: str | None = None) -> Any:
+    try:
+        user_ids = list(dict.fromkeys(uuid.UUID(i.strip()) for i in ids.split(",") if i.strip()))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid user id")
+    if len(user_ids) > BATCH_MAX_IDS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_IDS} ids per request")
+    # same rule as GET /users/{user_id}: non-superusers can only read themselves
+    if (not current_user.is_superuser) and any(i != current_user.id for i in user_ids):
+        raise HTTPException(status_code=403, detail="Not enough privileges")
+    selected = parse_fields(fields, UserPublic.model_fields)
+    if selected:
+        rows = session.exec(select_columns(User, selected).where(User.id.in_(user_ids))).all()
+        data = [row_dict(selected, r) for r in rows]
+        return sparse_response({"data": data, "count": len(data)})
+    users = session.exec(select(User).where(User.id.in_(user_ids))).all()
+    data = [UserPublic.model_validate(u) for u in users]
+    return UsersPublic(data=data, count=len(data))
+
 @router.get("/{user_id}", response_model=UserPublic)
-def read_user_by_id(session: SessionDep, current_user: CurrentUser, user_id: uuid.UUID) -> Any:
+def read_user_by_id(
+    session: SessionDep, current_user: CurrentUser, user_id: uuid.UUID, fields: str | None = None
+) -> Any:
+    selected = parse_fields(fields, UserPublic.model_fields)
+    if selected:
+        if (not current_user.is_superuser) and (user_id != current_user.id):
+            raise HTTPException(status_code=403, detail="Not enough privileges")
+        row = session.exec(select_columns(User, selected).where(User.id == user_id)).first()
+        if not row:
+            raise HTTPException(status_code=404, detail="User not found")
+        return sparse_response(row_dict(selected, row))
     user = session.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
@@ -43,7 +92,7 @@ def read_user_by_id(session: SessionDep, current_user: CurrentUser, user_id: uui
         raise HTTPException(status_code=403, detail="Not enough privileges")
     return UserPublic.model_validate(user)
 
-@router.delete("/{user_id}", response_model=Message)
+@router.delete("/{user_id}", response_model=Message, status_code=202)
 def delete_user(session: SessionDep, current_user: CurrentUser, user_id: uuid.UUID) -> Any:
     if not current_user.is_superuser:
         raise HTTPException(status_code=403, detail="Not enough privileges")
@@ -52,6 +101,26 @@ def delete_user(session: SessionDep, current_user: CurrentUser, user_id: uuid.UU
         raise HTTPException(status_code=404, detail="User not found")
     if user == current_user:
         raise HTTPException(status_code=403, detail="Super users are not allowed to delete themselves")
-    session.delete(user)
+    # Deactivate now (login and verify reject the user); the deletion worker removes
+    # the items in small chunks and then the user row.
+    user.is_active = False
+    session.add(user)
+    record_user_change(session, user)
+    job = session.get(UserDeletion, user_id)
+    if job is None:
+        session.add(UserDeletion(user_id=user_id))
+    elif job.status == "failed":
+        job.status, job.error = "pending", None
+        session.add(job)
     session.commit()
-    return Message(message="User deleted successfully")
+    deletion_worker.wake()
+    return Message(message="User deletion scheduled")
+
+@router.get("/{user_id}/deletion", response_model=UserDeletionPublic)
+def read_user_deletion(session: SessionDep, current_user: CurrentUser, user_id: uuid.UUID) -> Any:
+    if not current_user.is_superuser:
+        raise HTTPException(status_code=403, detail="Not enough privileges")
+    job = session.get(UserDeletion, user_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="No deletion scheduled for this user")
+    return UserDeletionPublic.model_validate(job)
@@ -7,5 +7,8 @@ class Settings(BaseSettings):
     SECRET_KEY: str = "change-me"  # must match AUTH service for JWT validation
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
     ENVIRONMENT: str = "local"
+    # "replicated": items keeps its own copy of the user table, fed from the
+    # user_outbox written here. "shared": items reads the user table, no outbox.
+    PRINCIPAL_SOURCE: str = "shared"
 
 settings = Settings()
@@ -1,6 +1,8 @@
 import os
 from sqlmodel import create_engine
 
+from app.core.replicas import ReplicaRouter
+
 # Read from environment with sensible defaults for local dev
 DATABASE_HOST = os.getenv("DATABASE_HOST", "localhost")
 DATABASE_PORT = os.getenv("DATABASE_PORT", "5432")
@@ -14,4 +16,64 @@ DATABASE_URL = os.getenv(
     f"postgresql://{DATABASE_USER}:{DATABASE_PASSWORD}@{DATABASE_HOST}:{DATABASE_PORT}/{DATABASE_NAME}"
 )
 
-engine = create_engine(DATABASE_URL, echo=True)
\ No newline at end of file
+# Optional read replicas, comma separated. Empty means every query goes to the primary.
+DATABASE_REPLICA_URLS = [
+    url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()
+]
+
+# Waiting longer than this for a pooled connection fails the request with 503
+# instead of queueing it behind requests the client may have given up on.
+DB_POOL_TIMEOUT_SECONDS = float(os.getenv("DB_POOL_TIMEOUT_SECONDS", "5"))
+
+# "psycopg2" (default) or "psycopg" (psycopg 3). With psycopg 3 a statement run
+# DB_PREPARE_THRESHOLD times on a connection becomes a server-side prepared
+# statement, parsed and planned once. Leave the threshold empty to disable
+# preparing (required behind PgBouncer in transaction pooling mode).
+DB_DRIVER = os.getenv("DB_DRIVER", "psycopg2")
+DB_PREPARE_THRESHOLD = os.getenv("DB_PREPARE_THRESHOLD", "2")
+
+
+def engine_url(url: str, driver: str = DB_DRIVER) -> str:
+    scheme, sep, rest = url.partition("://")
+    if scheme in ("postgresql", "postgresql+psycopg2", "postgresql+psycopg"):
+        return f"postgresql+{driver}{sep}{rest}"
+    return url
+
+
+def connect_args(url: str, **args) -> dict:
+    if url.startswith("postgresql+psycopg:"):
+        args["prepare_threshold"] = int(DB_PREPARE_THRESHOLD) if DB_PREPARE_THRESHOLD else None
+    return args
+
+
+engine = create_engine(
+    engine_url(DATABASE_URL),
+    echo=True,
+    pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+    connect_args=connect_args(engine_url(DATABASE_URL)),
+)
+replica_engines = [
+    create_engine(
+        engine_url(url),
+        echo=True,
+        pool_pre_ping=True,
+        pool_timeout=DB_POOL_TIMEOUT_SECONDS,
+        connect_args=connect_args(engine_url(url), connect_timeout=2),
+    )
+    for url in DATABASE_REPLICA_URLS
+]
+
+replica_router = ReplicaRouter(
+    engine,
+    replica_engines,
+    max_lag_seconds=float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5")),
+    check_interval=float(os.getenv("REPLICA_CHECK_INTERVAL_SECONDS", "2")),
+    sticky_seconds=float(os.getenv("REPLICA_STICKY_SECONDS", "5")),
+)
+
+
+def dispose_engines() -> None:
+    # Each uvicorn worker is a spawned process that imports this module afresh,
+    # so engines and pools are never shared across workers.
+    for e in (engine, *replica_engines):
+        e.dispose()
@@ -0,0 +1,163 @@
+import os
+import threading
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import Column, Connection, Engine, MetaData, Table, Uuid, and_, delete, or_, select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.db import engine
+from app.core.outbox import record_user_deleted
+from app.models import User, UserDeletion
+
+USER_DELETE_CHUNK_SIZE = int(os.getenv("USER_DELETE_CHUNK_SIZE", "500"))
+USER_DELETE_PAUSE_MS = float(os.getenv("USER_DELETE_PAUSE_MS", "50"))
+USER_DELETE_POLL_SECONDS = float(os.getenv("USER_DELETE_POLL_SECONDS", "5"))
+# false when items live in their own database: the items service then deletes the
+# items itself when it consumes the user's delete event from the outbox.
+USER_DELETE_ITEMS = os.getenv("USER_DELETE_ITEMS", "true").lower() in ("1", "true", "yes")
+# A running job not updated for this long belongs to a dead worker and is taken over.
+USER_DELETE_STALE_SECONDS = float(os.getenv("USER_DELETE_STALE_SECONDS", "120"))
+
+# The item table belongs to the items service; only the columns needed here.
+item = Table("item", MetaData(), Column("id", Uuid, primary_key=True), Column("owner_id", Uuid))
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class UserDeletionWorker:
+    """Delete users' items in bounded chunks, then the user row.
+
+    Each chunk is its own short transaction (at most ``chunk_size`` rows) followed
+    by a pause, so locks stay short and replicas keep up. Progress is stored on the
+    ``user_deletion`` row. Jobs are claimed with a conditional UPDATE, so several
+    pods can run the worker; deleting is idempotent if a job is ever resumed.
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        *,
+        chunk_size: int,
+        pause: float,
+        poll_interval: float,
+        stale_after: float,
+        delete_items: bool = True,
+    ) -> None:
+        self.engine = engine
+        self.delete_items = delete_items
+        self.chunk_size = chunk_size
+        self.pause = pause
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="user-deletion", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                user_id = self._claim()
+                if user_id is not None:
+                    self._process(user_id)
+                    continue
+            except SQLAlchemyError:
+                pass  # database unavailable, retry on the next poll
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+
+    def _claimable(self):
+        stale = utcnow() - timedelta(seconds=self.stale_after)
+        return or_(
+            UserDeletion.status == "pending",
+            and_(UserDeletion.status == "running", UserDeletion.updated_at < stale),
+        )
+
+    def _claim(self) -> uuid.UUID | None:
+        with self.engine.begin() as conn:
+            candidates = conn.execute(
+                select(UserDeletion.user_id).where(self._claimable()).order_by(UserDeletion.requested_at).limit(5)
+            ).scalars().all()
+        for user_id in candidates:
+            with self.engine.begin() as conn:
+                claimed = conn.execute(
+                    update(UserDeletion)
+                    .where(UserDeletion.user_id == user_id, self._claimable())
+                    .values(status="running", updated_at=utcnow())
+                ).rowcount
+            if claimed:
+                return user_id
+        return None
+
+    def _set(self, user_id: uuid.UUID, **values) -> None:
+        with self.engine.begin() as conn:
+            conn.execute(
+                update(UserDeletion).where(UserDeletion.user_id == user_id).values(updated_at=utcnow(), **values)
+            )
+
+    def _delete_chunk(self, conn: Connection, user_id: uuid.UUID) -> int:
+        chunk = select(item.c.id).where(item.c.owner_id == user_id).limit(self.chunk_size)
+        # owner_id on the outer DELETE too, so a partitioned item table is pruned
+        deleted = conn.execute(delete(item).where(item.c.owner_id == user_id, item.c.id.in_(chunk))).rowcount
+        conn.execute(
+            update(UserDeletion)
+            .where(UserDeletion.user_id == user_id)
+            .values(items_deleted=UserDeletion.items_deleted + deleted, updated_at=utcnow())
+        )
+        return deleted
+
+    def _process(self, user_id: uuid.UUID) -> None:
+        try:
+            while self.delete_items:
+                with self.engine.begin() as conn:
+                    deleted = self._delete_chunk(conn, user_id)
+                if deleted < self.chunk_size:
+                    break
+                if self._stop.wait(self.pause):
+                    # Shutting down: hand the job back, another worker resumes it.
+                    self._set(user_id, status="pending")
+                    return
+            with self.engine.begin() as conn:
+                # A request that passed its is_active check before the user was
+                # deactivated can still add an item after the last chunk, which
+                # would fail the user delete on the foreign key. Locking the user
+                # row blocks new references to it; what is left is swept here.
+                conn.execute(select(User.id).where(User.id == user_id).with_for_update())
+                while self.delete_items and self._delete_chunk(conn, user_id) == self.chunk_size:
+                    pass
+                conn.execute(delete(User).where(User.id == user_id))
+                record_user_deleted(conn, user_id)
+                conn.execute(
+                    update(UserDeletion)
+                    .where(UserDeletion.user_id == user_id)
+                    .values(status="done", finished_at=utcnow(), updated_at=utcnow())
+                )
+        except SQLAlchemyError as exc:
+            self._set(user_id, status="failed", error=str(exc)[:255])
+
+
+deletion_worker = UserDeletionWorker(
+    engine,
+    chunk_size=USER_DELETE_CHUNK_SIZE,
+    pause=USER_DELETE_PAUSE_MS / 1000,
+    poll_interval=USER_DELETE_POLL_SECONDS,
+    stale_after=USER_DELETE_STALE_SECONDS,
+    delete_items=USER_DELETE_ITEMS,
+)
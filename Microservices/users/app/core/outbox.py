@@ -0,0 +1,32 @@
+import uuid
+
+from sqlalchemy import Connection, insert
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.models import User, UserOutbox
+
+# Only items in replicated mode reads the outbox (and deletes delivered rows).
+OUTBOX_ENABLED = settings.PRINCIPAL_SOURCE == "replicated"
+
+
+def record_user_change(session: Session, user: User) -> None:
+    """Queue the user's current state in the outbox, committed with the session."""
+    if not OUTBOX_ENABLED:
+        return
+    session.add(
+        UserOutbox(
+            user_id=user.id,
+            op="upsert",
+            email=user.email,
+            full_name=user.full_name,
+            is_active=user.is_active,
+            is_superuser=user.is_superuser,
+        )
+    )
+
+
+def record_user_deleted(conn: Connection, user_id: uuid.UUID) -> None:
+    if not OUTBOX_ENABLED:
+        return
+    conn.execute(insert(UserOutbox).values(user_id=user_id, op="delete"))
@@ -0,0 +1,59 @@
+from typing import Any
+
+from sqlalchemy import Dialect, Select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.util import LRUCache
+from sqlmodel import Session
+
+# SQL text compiled per statement shape (SQLAlchemy cache key), so pipelined
+# statements are not recompiled on every request. Identical text is also what
+# lets psycopg reuse its server-side prepared statement.
+_compiled: LRUCache = LRUCache(500)
+
+
+def _sql(statement: Select, dialect: Dialect) -> tuple[str, dict[str, Any]]:
+    key = statement._generate_cache_key()
+    if key is None:
+        compiled = statement.compile(dialect=dialect)
+        return compiled.string, compiled.params
+    compiled = _compiled.get(key.key)
+    if compiled is None:
+        compiled = dialect.statement_compiler(dialect, statement, cache_key=key)
+        _compiled[key.key] = compiled
+    return compiled.string, compiled.construct_params(extracted_parameters=key.bindparams)
+
+
+def execute_pipelined(session: Session, *statements: Select) -> list[list[Any]]:
+    """Run read statements in one round trip and return the rows of each.
+
+    With psycopg 3 the statements are sent together in pipeline mode (e.g. a
+    page and its count); with other drivers they run one after the other.
+    Rows are plain tuples in the statement's column order.
+    """
+    connection = session.connection()
+    if connection.dialect.driver != "psycopg":
+        return [session.execute(statement).all() for statement in statements]
+    dialect = connection.dialect
+    driver_connection = connection.connection.driver_connection
+    cursors = []
+    sql, params = None, None
+    try:
+        with driver_connection.pipeline():
+            for statement in statements:
+                sql, params = _sql(statement, dialect)
+                cursor = driver_connection.cursor()
+                cursors.append(cursor)
+                cursor.execute(sql, params)
+        return [cursor.fetchall() for cursor in cursors]
+    except dialect.loaded_dbapi.Error as exc:
+        # Raw cursors bypass SQLAlchemy: wrap the error as it would have (e.g.
+        # QueryCanceled -> OperationalError), so the 503/504 handlers apply.
+        invalidated = dialect.is_disconnect(exc, driver_connection, None)
+        if invalidated:
+            connection.invalidate(exc)
+        raise DBAPIError.instance(
+            sql, params, exc, dialect.loaded_dbapi.Error, connection_invalidated=invalidated, dialect=dialect
+        ) from exc
+    finally:
+        for cursor in cursors:
+            cursor.close()
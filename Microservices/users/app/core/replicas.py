@@ -0,0 +1,141 @@
+import itertools
+import threading
+import time
+from collections.abc import Callable
+from typing import Any
+
+from fastapi import Request
+from sqlalchemy import Engine, text
+
+# Replication lag in seconds; 0 when the replica has replayed everything it received.
+LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() THEN 0 "
+    "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# A successful write stamps its response with the time until which the client
+# reads from the primary. The client sends it back (cookie, or the header for
+# non-browser clients), so every worker and pod honours it.
+READ_PRIMARY_COOKIE = "read_primary_until"
+READ_PRIMARY_HEADER = "X-Read-Primary-Until"
+
+
+class ReplicaRouter:
+    """Pick an engine for each request: replicas for reads, the primary for writes.
+
+    Replicas are health/lag checked at most once per ``check_interval`` and skipped
+    while unreachable or lagging more than ``max_lag_seconds``. A principal that
+    just wrote keeps reading from the primary for ``sticky_seconds`` so it always
+    sees its own writes: within this process by principal, across workers and
+    pods through the marker set by ``ReadYourWritesMiddleware``. When no replica
+    is usable, reads fall back to the primary.
+    """
+
+    def __init__(
+        self,
+        primary: Engine,
+        replicas: list[Engine],
+        *,
+        max_lag_seconds: float = 5.0,
+        check_interval: float = 2.0,
+        sticky_seconds: float = 5.0,
+    ) -> None:
+        self.primary = primary
+        self.replicas = replicas
+        self.max_lag_seconds = max_lag_seconds
+        self.check_interval = check_interval
+        self.sticky_seconds = sticky_seconds
+        # replica index -> (monotonic time of last check, healthy)
+        self._health: dict[int, tuple[float, bool]] = {}
+        self._check_locks = [threading.Lock() for _ in replicas]
+        self._recent_writes: dict[str, float] = {}
+        self._cycle = itertools.count()
+
+    def mark_write(self, principal: str | None) -> None:
+        if not principal or not self.replicas:
+            return
+        now = time.monotonic()
+        self._recent_writes[principal] = now + self.sticky_seconds
+        if len(self._recent_writes) > 10_000:
+            self._recent_writes = {p: t for p, t in self._recent_writes.items() if t > now}
+
+    def engine_for_read(self, principal: str | None = None, primary_until: float = 0.0) -> Engine:
+        if not self.replicas:
+            return self.primary
+        # Markers further ahead than a write could have set (allowing for clock
+        # skew between pods) are ignored.
+        if time.time() < primary_until < time.time() + 2 * self.sticky_seconds:
+            return self.primary
+        if principal and self._recent_writes.get(principal, 0.0) > time.monotonic():
+            return self.primary
+        start = next(self._cycle)
+        for offset in range(len(self.replicas)):
+            index = (start + offset) % len(self.replicas)
+            if self._is_healthy(index):
+                return self.replicas[index]
+        return self.primary
+
+    def _is_healthy(self, index: int) -> bool:
+        checked_at, healthy = self._health.get(index, (float("-inf"), False))
+        if time.monotonic() - checked_at < self.check_interval:
+            return healthy
+        # Only one request re-checks a replica; the others keep the last known state.
+        lock = self._check_locks[index]
+        if not lock.acquire(blocking=False):
+            return healthy
+        try:
+            healthy = self._check(self.replicas[index])
+            self._health[index] = (time.monotonic(), healthy)
+            return healthy
+        finally:
+            lock.release()
+
+    def _check(self, replica: Engine) -> bool:
+        try:
+            with replica.connect() as conn:
+                lag = conn.execute(LAG_QUERY).scalar()
+        except Exception:
+            return False
+        return float(lag or 0) <= self.max_lag_seconds
+
+
+def read_primary_until(request: Request) -> float:
+    """The marker a client sent back (wall-clock seconds), 0 if none or invalid."""
+    raw = request.headers.get(READ_PRIMARY_HEADER) or request.cookies.get(READ_PRIMARY_COOKIE)
+    try:
+        return float(raw) if raw else 0.0
+    except ValueError:
+        return 0.0
+
+
+class ReadYourWritesMiddleware:
+    """Mark successful write responses with the read-from-primary deadline."""
+
+    def __init__(self, app: Any, router: ReplicaRouter) -> None:
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope: dict, receive: Callable, send: Callable) -> None:
+        if scope["type"] != "http" or scope["method"] in READ_METHODS or not self.router.replicas:
+            await self.app(scope, receive, send)
+            return
+
+        async def marked_send(message: dict) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                seconds = self.router.sticky_seconds
+                until = f"{time.time() + seconds:.3f}".encode()
+                cookie = f"{READ_PRIMARY_COOKIE}={until.decode()}; Max-Age={seconds:.0f}; Path=/; HttpOnly; SameSite=Lax"
+                message = {
+                    **message,
+                    "headers": [
+                        *message["headers"],
+                        (READ_PRIMARY_HEADER.lower().encode(), until),
+                        (b"set-cookie", cookie.encode()),
+                    ],
+                }
+            await send(message)
+
+        await self.app(scope, receive, marked_send)
@@ -1,10 +1,20 @@
+import time
+_import_started = time.perf_counter()
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from sqlmodel import SQLModel
-from app.api.routes import users
-from app.core.db import engine
+from app.api.routes import health, users
+from app.core.compression import CompressionMiddleware
+from app.core.db import dispose_engines, engine, replica_router
+from app.core.deadline import EXCEPTION_HANDLERS, DeadlineMiddleware
+from app.core.deletion import deletion_worker
+from app.core.health import SHUTDOWN_DRAIN_SECONDS, prober
+from app.core.replicas import ReadYourWritesMiddleware
+from app.core.schema import DB_SCHEMA_MODE, prepare_database
+
+_import_seconds = time.perf_counter() - _import_started
 
-app = FastAPI(title="Users Service")
+app = FastAPI(title="Users Service", exception_handlers=EXCEPTION_HANDLERS)
 
 # CORS Configuration - AJOUT ICI
 app.add_middleware(
@@ -14,11 +24,35 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(ReadYourWritesMiddleware, router=replica_router)
+app.add_middleware(CompressionMiddleware)
+# Outermost, so the request budget starts when the request arrives.
+app.add_middleware(DeadlineMiddleware)
 
 # include routes
 app.include_router(users.router)
+app.include_router(health.router)
 
 # initialize database (safe if already created)
 @app.on_event("startup")
 def on_startup() -> None:
-    SQLModel.metadata.create_all(engine)
\ No newline at end of file
+    started = time.perf_counter()
+    prepare_database(engine)
+    print(
+        f"Startup: imports {_import_seconds * 1000:.0f} ms, "
+        f"schema ({DB_SCHEMA_MODE}) {(time.perf_counter() - started) * 1000:.0f} ms"
+    )
+    prober.start()
+    deletion_worker.start()
+
+@app.on_event("startup")
+async def drain_on_sigterm() -> None:
+    # async: signal handlers can only be set from the main (event loop) thread
+    prober.drain_on_sigterm(SHUTDOWN_DRAIN_SECONDS)
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    # uvicorn has already drained in-flight requests at this point.
+    prober.stop()
+    deletion_worker.stop()
+    dispose_engines()
@@ -1,5 +1,7 @@
 import uuid
+from datetime import datetime, timezone
 from pydantic import EmailStr
+from sqlalchemy import DateTime
 from sqlmodel import Field, SQLModel
 
 # DB-mapped model mirrors the shared 'user' table (owned by AUTH).
@@ -30,6 +32,39 @@ class UserUpdate(SQLModel):
     is_active: bool | None = None   # superuser only
     is_superuser: bool | None = None  # superuser only
 
+# Change stream of the user table for services keeping a local copy of it (items).
+# Rows are written in the same transaction as the user change; consumers follow seq.
+class UserOutbox(SQLModel, table=True):
+    __tablename__ = "user_outbox"
+    seq: int | None = Field(default=None, primary_key=True)
+    user_id: uuid.UUID = Field(index=True)
+    op: str = Field(max_length=16)  # upsert | delete
+    email: str | None = Field(default=None, max_length=255)
+    full_name: str | None = Field(default=None, max_length=255)
+    is_active: bool = False
+    is_superuser: bool = False
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), sa_type=DateTime(timezone=True))
+
+# Background deletion job for a user and their items (see app/core/deletion.py).
+# No FK to user: the user row is removed as the last step of the job.
+class UserDeletion(SQLModel, table=True):
+    __tablename__ = "user_deletion"
+    user_id: uuid.UUID = Field(primary_key=True)
+    status: str = Field(default="pending", max_length=16)  # pending | running | done | failed
+    items_deleted: int = 0
+    requested_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    finished_at: datetime | None = None
+    error: str | None = Field(default=None, max_length=255)
+
+class UserDeletionPublic(SQLModel):
+    user_id: uuid.UUID
+    status: str
+    items_deleted: int
+    requested_at: datetime
+    finished_at: datetime | None = None
+    error: str | None = None
+
 class Message(SQLModel):
     message: str
 
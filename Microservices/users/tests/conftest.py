@@ -0,0 +1,66 @@
+"""Run from the service directory: ``python -m pytest tests``.
+
+Tests use a scratch SQLite database, or TEST_DATABASE_URL (an empty Postgres
+database). Settings are read at import time, so the environment is set here
+before anything imports ``app``.
+"""
+import os
+import sys
+import tempfile
+import uuid
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/users.db"
+os.environ.setdefault("USER_DELETE_POLL_SECONDS", "0.1")
+os.environ.setdefault("USER_DELETE_PAUSE_MS", "0")
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import jwt  # noqa: E402
+import pytest  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlmodel import Session  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.core.db import engine  # noqa: E402
+from app.core.deletion import item  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import User  # noqa: E402
+
+engine.echo = False
+
+requires_postgres = pytest.mark.skipif(
+    engine.dialect.name != "postgresql", reason="needs TEST_DATABASE_URL=postgresql://..."
+)
+# The item table belongs to the items service; the deletion worker only needs its keys.
+item.create(engine, checkfirst=True)
+
+
+def token(user_id: uuid.UUID) -> str:
+    expire = datetime.now(timezone.utc) + timedelta(hours=1)
+    return jwt.encode({"sub": str(user_id), "exp": expire}, settings.SECRET_KEY, algorithm="HS256")
+
+
+def make_user(*, superuser: bool = False) -> tuple[uuid.UUID, dict[str, str]]:
+    """A fresh user and its auth headers."""
+    user_id = uuid.uuid4()
+    with Session(engine) as session:
+        session.add(
+            User(
+                id=user_id, email=f"{user_id.hex}@example.com", hashed_password="x",
+                full_name=f"User {user_id.hex[:6]}", is_superuser=superuser,
+            )
+        )
+        session.commit()
+    return user_id, {"Authorization": f"Bearer {token(user_id)}"}
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+@pytest.fixture
+def admin() -> dict[str, str]:
+    return make_user(superuser=True)[1]
@@ -0,0 +1,52 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+from conftest import requires_postgres
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+# What a new pod may spend importing app.main and checking the schema version.
+COLD_START_BUDGET_MS = float(os.getenv("COLD_START_BUDGET_MS", "1500"))
+# Modules that must not be imported until first use.
+DEFERRED_MODULES = ["zstandard", "brotli"]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+from app.core.db import engine
+from app.core.schema import prepare_database
+prepare_database(engine)
+done = time.perf_counter()
+print(json.dumps({
+    "import_ms": (imported - started) * 1000,
+    "schema_ms": (done - imported) * 1000,
+    "loaded": [m for m in sys.argv[1:] if m in sys.modules],
+}))
+"""
+
+
+def cold_start() -> dict:
+    """Import and startup schema step in a fresh interpreter, as a new pod does."""
+    run = subprocess.run(
+        [sys.executable, "-c", PROBE, *DEFERRED_MODULES],
+        cwd=SERVICE_DIR, env={**os.environ, "DB_SCHEMA_MODE": "check"}, capture_output=True, text=True,
+    )
+    assert run.returncode == 0, run.stderr
+    # The engine may echo SQL on stdout, the report is the last line.
+    return json.loads(run.stdout.strip().splitlines()[-1])
+
+
+def test_heavy_modules_are_deferred_until_first_use(client):
+    assert cold_start()["loaded"] == []
+
+
+@requires_postgres
+def test_cold_start_within_budget(client):
+    runs = [cold_start() for _ in range(3)]
+    total_ms = statistics.median(r["import_ms"] + r["schema_ms"] for r in runs)
+    assert total_ms <= COLD_START_BUDGET_MS, runs
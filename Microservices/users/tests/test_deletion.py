@@ -0,0 +1,65 @@
+import time
+import uuid
+
+from sqlalchemy import func, insert, select
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.core.deletion import UserDeletionWorker, item
+from app.models import User
+from conftest import make_user
+
+
+def add_items(owner_id: uuid.UUID, count: int) -> None:
+    with engine.begin() as conn:
+        conn.execute(insert(item), [{"id": uuid.uuid4(), "owner_id": owner_id} for _ in range(count)])
+
+
+def items_of(owner_id: uuid.UUID) -> int:
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(item).where(item.c.owner_id == owner_id)).scalar()
+
+
+def test_delete_user_removes_items_then_the_user(client, admin):
+    user_id, headers = make_user()
+    add_items(user_id, 7)
+
+    assert client.delete(f"/users/{user_id}", headers=admin).status_code == 202
+    # Deactivated at once (or already gone): the user can no longer act while the job runs.
+    me = client.get("/users/me", headers=headers)
+    assert me.status_code == 404 or me.json()["is_active"] is False
+    deadline = time.monotonic() + 10
+    while (job := client.get(f"/users/{user_id}/deletion", headers=admin).json())["status"] != "done":
+        assert job["status"] in ("pending", "running"), job
+        assert time.monotonic() < deadline, job
+        time.sleep(0.05)
+
+    assert job["items_deleted"] == 7
+    assert items_of(user_id) == 0
+    with Session(engine) as session:
+        assert session.get(User, user_id) is None
+
+
+def test_items_added_after_the_last_chunk_are_swept_with_the_user(client):
+    user_id, _ = make_user()
+    add_items(user_id, 3)
+
+    class RacingWorker(UserDeletionWorker):
+        raced = False
+
+        def _delete_chunk(self, conn, user_id):
+            deleted = super()._delete_chunk(conn, user_id)
+            if deleted < self.chunk_size and not self.raced:
+                # A request that passed its is_active check just before the
+                # user was deactivated inserts an item after the last chunk.
+                self.raced = True
+                conn.execute(insert(item).values(id=uuid.uuid4(), owner_id=user_id))
+            return deleted
+
+    worker = RacingWorker(engine, chunk_size=2, pause=0, poll_interval=1, stale_after=60)
+    worker._process(user_id)
+
+    assert worker.raced
+    assert items_of(user_id) == 0
+    with Session(engine) as session:
+        assert session.get(User, user_id) is None
@@ -0,0 +1,43 @@
+import uuid
+
+from app.api.routes.users import BATCH_MAX_IDS
+from conftest import make_user
+
+
+def test_batch_returns_each_requested_user_once(client, admin):
+    ids = [make_user()[0] for _ in range(3)]
+    query = ",".join(str(i) for i in [*ids, ids[0], uuid.uuid4()])  # a duplicate and an unknown id
+
+    response = client.get("/users/batch", params={"ids": query}, headers=admin)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 3
+    assert {u["id"] for u in body["data"]} == {str(i) for i in ids}
+
+
+def test_batch_lets_regular_users_read_only_themselves(client):
+    user_id, headers = make_user()
+    other_id, _ = make_user()
+
+    assert client.get("/users/batch", params={"ids": str(user_id)}, headers=headers).json()["count"] == 1
+    assert client.get("/users/batch", params={"ids": f"{user_id},{other_id}"}, headers=headers).status_code == 403
+
+
+def test_batch_rejects_bad_and_oversized_id_lists(client, admin):
+    assert client.get("/users/batch", params={"ids": "not-a-uuid"}, headers=admin).status_code == 400
+    too_many = ",".join(str(uuid.uuid4()) for _ in range(BATCH_MAX_IDS + 1))
+    assert client.get("/users/batch", params={"ids": too_many}, headers=admin).status_code == 400
+
+
+def test_fields_select_only_the_requested_columns(client, admin):
+    user_id, _ = make_user()
+
+    one = client.get(f"/users/{user_id}", params={"fields": "email"}, headers=admin).json()
+    batch = client.get("/users/batch", params={"ids": str(user_id), "fields": "full_name"}, headers=admin).json()
+    page = client.get("/users/", params={"fields": "email", "limit": 5}, headers=admin).json()
+
+    assert set(one) == {"id", "email"}  # id is always included
+    assert batch["data"] == [{"id": str(user_id), "full_name": f"User {user_id.hex[:6]}"}]
+    assert all(set(u) == {"id", "email"} for u in page["data"])
+    assert client.get("/users/", params={"fields": "hashed_password"}, headers=admin).status_code == 400